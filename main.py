@@ -1,14 +1,21 @@
 from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+from cachetools import TTLCache
+from prometheus_client import CollectorRegistry, Counter, Histogram, make_asgi_app, multiprocess
+import orjson
 import logging
 import os
+import queue
 import time
 import uuid
 import asyncio
 import sys
+from typing import Dict, Tuple
+from logging.handlers import QueueHandler, QueueListener
 
 from models.api_models import (
     RecommendationRequest,
@@ -18,26 +25,47 @@ from models.api_models import (
     PriceSuggestRequest,
     PriceSuggestResponse,
 )
-from models.db_models import UserDB
 from utils.database import get_db, SessionLocal
-from utils.recommender import AuctionRecommender
+from utils.recommender import (
+    AuctionRecommender,
+    UserNotFoundError,
+    get_recommender,
+    init_recommender,
+    invalidate_recommender,
+)
 from utils.market_price_service import MarketPriceService
+from utils.price_crawler_selenium import close_driver_pool
 from utils.price_ai import format_price_message
-from services.virtual_tryon import run_virtual_tryon
+from services.virtual_tryon import run_virtual_tryon, warm_up_clients
+
+# 로깅 설정
+# - 요청 처리 코드는 QueueHandler에 레코드만 넣고, 실제 stdout 출력은 QueueListener 스레드가 담당
+# - 이벤트 루프/워커 스레드가 터미널 I/O에 막히지 않도록 함
+_log_queue: queue.Queue = queue.Queue(-1)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[QueueHandler(_log_queue)],
+)
+_log_listener.start()
+logger = logging.getLogger("valuebid-ai")
 
 # Windows 환경에서 Playwright 호환성을 위한 이벤트 루프 정책 설정
 if sys.platform == "win32":
     try:
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-        print("✅ Windows 이벤트 루프 정책 변경 완료")
+        logger.info("Windows 이벤트 루프 정책 변경 완료")
     except Exception as e:
-        print(f"⚠️ 이벤트 루프 정책 변경 실패: {e}")
+        logger.warning("이벤트 루프 정책 변경 실패: %s", e)
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-logger = logging.getLogger("valuebid-ai")
-
-# 전역 추천 인스턴스
-recommender_instance: AuctionRecommender = None
+# 사용자별 추천 결과 캐시 (TTL 동안 추천 엔진 호출 생략)
+# - 키: (user_id, 추천기 버전) → 추천기 재빌드 시 이전 결과는 자동으로 무효화
+# - 값: (추천 수, 직렬화된 JSON 응답 바이트) → 캐시 히트 시 재검증/재직렬화 없이 그대로 전송
+# - async 엔드포인트의 이벤트 루프에서만 접근하므로 별도 락 불필요
+REC_CACHE_TTL = int(os.getenv("REC_CACHE_TTL", "60"))
+_rec_cache: TTLCache = TTLCache(maxsize=10000, ttl=REC_CACHE_TTL)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -47,28 +75,30 @@ async def lifespan(app: FastAPI):
     - 피처 매트릭스 생성
     - 유사도 행렬 계산
     """
-    global recommender_instance
-
     logger.info("서버 시작 중: AuctionRecommender 초기화...")
     
-    db_session = SessionLocal()
-    try:
-        recommender_instance = AuctionRecommender(db_session)
-    finally:
-        db_session.close()
+    # 이후 재빌드는 만료/무효화 시 utils.recommender 가 백그라운드에서 수행
+    await asyncio.to_thread(init_recommender)
     
+    # 가상 피팅 Client 워밍업은 서버 기동을 막지 않도록 백그라운드에서 진행
+    warmup_task = asyncio.create_task(warm_up_clients())
+
     logger.info("서버가 요청을 처리할 준비가 되었습니다!")
     
     yield  # 서버 실행
     
     logger.info("서버 종료 중...")
+    warmup_task.cancel()
+    await asyncio.to_thread(close_driver_pool)
+    _log_listener.stop()
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="Auction Recommendation API",
     description="경매 상품 추천 API - 협업 필터링 기반",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS 설정 (Spring Boot에서 호출 가능하도록)
@@ -87,14 +117,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_recommender_instance() -> AuctionRecommender:
-    """FastAPI 의존성 주입용 함수"""
-    if recommender_instance is None:
+# Prometheus 메트릭
+# - 요청별 소요 시간은 로그 대신 히스토그램으로 집계하고 /metrics 로 노출
+# - 멀티 워커 실행 시 PROMETHEUS_MULTIPROC_DIR 를 지정하면 워커 간 값을 합산해서 노출
+REC_LATENCY = Histogram(
+    "recommend_latency_seconds",
+    "추천 엔진 호출 소요 시간(초)",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+REC_REQUESTS = Counter(
+    "recommend_requests_total",
+    "추천 API 요청 수",
+    ["cache"],
+)
+
+
+def _metrics_app():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry=registry)
+    return make_asgi_app()
+
+
+app.mount("/metrics", _metrics_app())
+
+def get_recommender_instance() -> Tuple[AuctionRecommender, int]:
+    """FastAPI 의존성 주입용 함수 - (공유 추천기, 버전) 반환"""
+    recommender, version = get_recommender()
+    if recommender is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Recommender not initialized"
         )
-    return recommender_instance
+    return recommender, version
 
 
 @app.get("/", response_model=HealthCheckResponse)
@@ -106,10 +162,10 @@ def health_check():
     )
 
 @app.post("/recommend-auctions", response_model=RecommendationResponse)
-def get_auction_recommendations(
+async def get_auction_recommendations(
     request: RecommendationRequest,
     db: Session = Depends(get_db),
-    recommender: AuctionRecommender = Depends(get_recommender_instance)
+    recommender_and_version: Tuple[AuctionRecommender, int] = Depends(get_recommender_instance)
 ):
     """
     경매 상품 추천 API
@@ -131,46 +187,76 @@ def get_auction_recommendations(
         }
     """
     logger.info("[/recommend-auctions] 요청 시작: user_id=%s", request.user_id)
-    start_time = time.time()
-    
+    recommender, recommender_version = recommender_and_version
+
     try:
-        # 1. 사용자 존재 확인
-        user_exists = db.query(UserDB.id).filter(UserDB.id == request.user_id).first()
-        if not user_exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"User with id {request.user_id} not found"
-            )
-        
-        # ⭐ 2. 추천 실행 (새 세션 전달)
-        recommended_items = recommender.recommend_items(
-            target_user_id=request.user_id,
-            n_recommendations=10,
-            db_session=db  # ⭐ 새 세션 전달
-        )
-        
-        elapsed = time.time() - start_time
+        # 1. 캐시 조회 (TTL 내 재요청은 DB/추천 엔진을 거치지 않음)
+        cache_key = (request.user_id, recommender_version)
+        cached = _rec_cache.get(cache_key)
+        from_cache = cached is not None
+
+        if from_cache:
+            item_count, body = cached
+        else:
+            # ⭐ 2. 추천 실행 (새 세션 전달, 사용자 존재 확인 포함)
+            try:
+                with REC_LATENCY.time():
+                    recommended_items = await asyncio.to_thread(
+                        recommender.recommend_items,
+                        target_user_id=request.user_id,
+                        n_recommendations=10,
+                        db_session=db  # ⭐ 새 세션 전달
+                    )
+            except UserNotFoundError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"User with id {e.user_id} not found"
+                )
+
+            # 응답 JSON은 한 번만 직렬화해서 캐시에 보관
+            item_count = len(recommended_items)
+            body = orjson.dumps({
+                "recommended_items": [item.model_dump(mode="json") for item in recommended_items]
+            })
+            # DB 오류로 폴백한 결과나 빈 결과는 캐시하지 않음 (다음 요청에서 다시 계산)
+            if item_count and not recommended_items.degraded:
+                _rec_cache[cache_key] = (item_count, body)
+
+        REC_REQUESTS.labels(cache="hit" if from_cache else "miss").inc()
         logger.info(
-            "[/recommend-auctions] 요청 완료: 추천 수=%s, 소요 시간=%.4f초",
-            len(recommended_items),
-            elapsed,
+            "[/recommend-auctions] 요청 완료: 추천 수=%s %s",
+            item_count,
+            "(캐시)" if from_cache else "",
         )
         
-        # 3. 응답 반환
-        return RecommendationResponse(recommended_items=recommended_items)
+        # 3. 응답 반환 (직렬화된 바이트를 그대로 전송)
+        return Response(content=body, media_type="application/json")
     
     except HTTPException:
         raise
     except Exception as e:
         # ⭐ 에러 발생 시 롤백
         logger.exception("[/recommend-auctions] 추천 API 오류")
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"추천 생성 중 오류 발생: {str(e)}"
         )
 
 
+@app.post("/recommend-auctions/invalidate", status_code=status.HTTP_202_ACCEPTED)
+def invalidate_recommendations():
+    """
+    추천기 무효화 API
+
+    입찰/찜/상품 등록 후 백엔드에서 호출하면 다음 추천 요청 시 추천기를 백그라운드에서 재빌드
+    - 무효화 신호는 REC_INVALIDATION_FILE 로 공유되어 요청을 받은 워커뿐 아니라 같은 컨테이너의 모든 워커에 적용
+    - 재빌드 완료 전까지는 기존 추천기(와 그 결과 캐시)로 응답
+    """
+    invalidate_recommender()
+    return {"status": "accepted"}
+
+
 @app.post("/virtual-tryon", response_model=TryOnResponse)
 async def virtual_tryon_endpoint(
     background: UploadFile = File(..., description="사람 사진"),
@@ -181,8 +267,6 @@ async def virtual_tryon_endpoint(
     seed: int = Form(42, description="랜덤 시드"),
 ):
     request_id = uuid.uuid4().hex
-    background_bytes = await background.read()
-    garment_bytes = await garment.read()
     logger.info(
         "[%s] /virtual-tryon 요청 진입 - desc=%s, crop=%s, denoise=%s, seed=%s, background_size=%s bytes, garment_size=%s bytes",
         request_id,
@@ -190,18 +274,17 @@ async def virtual_tryon_endpoint(
         crop,
         denoise_steps,
         seed,
-        len(background_bytes),
-        len(garment_bytes),
+        background.size,
+        garment.size,
     )
 
     try:
         logger.info("[%s] Hugging Face 호출 시작", request_id)
-        result_url, masked_url = await run_in_threadpool(
-            run_virtual_tryon,
-            background_bytes,
+        result_url, masked_url = await run_virtual_tryon(
+            background.file,
             background.content_type,
             background.filename,
-            garment_bytes,
+            garment.file,
             garment.content_type,
             garment.filename,
             garment_desc,
@@ -218,10 +301,51 @@ async def virtual_tryon_endpoint(
     return TryOnResponse(result_url=result_url, masked_url=masked_url)
 
 
+# 상품명별 진행 중인 시세 조회 (같은 상품명 동시 요청은 크롤링 1회를 공유)
+_price_inflight: Dict[str, "asyncio.Future[dict]"] = {}
+
+
+def _get_or_crawl_in_new_session(product_name: str) -> dict:
+    """
+    시세 조회/크롤링 실행 (공유 작업용 전용 세션 사용)
+
+    여러 요청이 결과를 기다리므로 특정 요청의 세션(요청 종료 시 닫힘)에 묶지 않음
+    """
+    db = SessionLocal()
+    try:
+        service = MarketPriceService(cache_hours=24)
+        # category: 카테고리는 Spring Boot에서 전달받도록 확장 가능
+        return service.get_or_crawl(db, product_name, None)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _get_or_crawl_coalesced(product_name: str) -> dict:
+    """진행 중인 같은 상품명 조회가 있으면 그 결과를 기다리고, 없으면 새로 시작"""
+    task = _price_inflight.get(product_name)
+    if task is None:
+        # 동기 함수를 스레드풀에서 실행
+        task = asyncio.ensure_future(run_in_threadpool(_get_or_crawl_in_new_session, product_name))
+        _price_inflight[product_name] = task
+
+        def _forget(done: "asyncio.Future[dict]") -> None:
+            if _price_inflight.get(product_name) is done:
+                del _price_inflight[product_name]
+
+        task.add_done_callback(_forget)
+    else:
+        logger.info("[/api/price-suggest] 진행 중인 시세 조회 공유: product_name=%s", product_name)
+
+    # 한 요청이 취소돼도 다른 요청이 기다리는 공유 작업은 계속 진행
+    return await asyncio.shield(task)
+
+
 @app.post("/api/price-suggest", response_model=PriceSuggestResponse)
 async def suggest_price(
     request: PriceSuggestRequest,
-    db: Session = Depends(get_db)
 ):
     """
     AI 가격 추천 API
@@ -239,16 +363,8 @@ async def suggest_price(
     start_time = time.time()
 
     try:
-        # 시세 서비스 초기화
-        service = MarketPriceService(cache_hours=24)
-
-        # 캐시 조회 또는 실시간 크롤링 (동기 함수를 스레드풀에서 실행)
-        result = await run_in_threadpool(
-            service.get_or_crawl,
-            db,
-            request.product_name,
-            None  # category: 카테고리는 Spring Boot에서 전달받도록 확장 가능
-        )
+        # 캐시 조회 또는 실시간 크롤링 (같은 상품명 동시 요청은 하나로 합침)
+        result = await _get_or_crawl_coalesced(request.product_name)
 
         suggested_price = result.get("suggested_start_price")
 
@@ -285,7 +401,6 @@ async def suggest_price(
 
     except Exception as e:
         logger.exception("[/api/price-suggest] 가격 추천 API 오류")
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"가격 추천 중 오류 발생: {str(e)}"
@@ -294,9 +409,16 @@ async def suggest_price(
 
 if __name__ == "__main__":
     import uvicorn
+
+    # 개발 환경(ENV=dev)은 단일 워커 + 자동 리로드, 그 외에는 멀티 워커로 실행
+    is_dev = os.getenv("ENV") == "dev"
+    workers = 1 if is_dev else int(os.getenv("UVICORN_WORKERS", max(2, os.cpu_count() or 1)))
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True  # 개발 환경에서만 True
-    )
\ No newline at end of file
+        host=os.getenv("UVICORN_HOST", "0.0.0.0"),
+        port=int(os.getenv("UVICORN_PORT", "8000")),
+        workers=workers,
+        loop="auto",  # uvloop이 설치되어 있으면 사용
+        http="httptools",
+        reload=is_dev,
+    )
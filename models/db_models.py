@@ -1,11 +1,21 @@
 from sqlalchemy import Column, BigInteger, String, Integer, Text, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Double, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from models.enums import CategoryEnum, ItemStatusEnum, RangeSettingEnum
-from datetime import datetime
 
 Base = declarative_base()
 
+
+def utc_now():
+    """
+    DB에서 평가되는 현재 UTC 시각 (timestamp without time zone)
+
+    - 기존 컬럼과 같은 naive UTC 기준이 되도록 세션 타임존과 무관하게 UTC로 변환
+    - 컬럼마다 새 표현식을 만들어 default/server_default/onupdate 에 사용
+    """
+    return func.timezone("utc", func.now())
+
 class UserDB(Base):
     """사용자 테이블"""
     __tablename__ = "users"
@@ -18,8 +28,8 @@ class UserDB(Base):
     profile_image = Column(String(200), nullable=True)
     phone_number = Column(String(20), unique=True, nullable=True)
     phone_verified_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # 관계 정의
     transactions = relationship("ItemTransactionDB", back_populates="buyer", foreign_keys="ItemTransactionDB.buyer_id")
@@ -44,8 +54,8 @@ class ItemDB(Base):
     region_id = Column(BigInteger, ForeignKey("region.region_id"), nullable=False)
     view_count = Column(BigInteger, nullable=False, default=0)
     bid_count = Column(BigInteger, nullable=False, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # 관계 정의
     seller = relationship("UserDB", foreign_keys=[seller_id])
@@ -62,7 +72,7 @@ class ItemTransactionDB(Base):
     buyer_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)  # 입찰자
     item_id = Column(BigInteger, ForeignKey("item.item_id"), nullable=False)  # 입찰한 상품
     bid_price = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
     
     # 관계 정의
     buyer = relationship("UserDB", back_populates="transactions", foreign_keys=[buyer_id])
@@ -76,8 +86,8 @@ class UserLikedDB(Base):
     user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)  # 찜한 사용자
     item_id = Column(BigInteger, ForeignKey("item.item_id"), nullable=False)  # 찜한 상품
     liked = Column(Boolean, nullable=False, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # 관계 정의
     user = relationship("UserDB", back_populates="liked_items", foreign_keys=[user_id])
@@ -105,7 +115,7 @@ class MarketPriceDB(Base):
     min_price = Column(Integer, nullable=True)  # 최저가
     max_price = Column(Integer, nullable=True)  # 최고가
     sample_count = Column(Integer, nullable=True)  # 분석한 상품 수
-    crawled_at = Column(DateTime, default=datetime.utcnow, index=True)  # 크롤링 시각
+    crawled_at = Column(DateTime, default=utc_now(), server_default=utc_now(), index=True)  # 크롤링 시각
 
     # 키워드+플랫폼 조합은 유일 (UPSERT를 위해)
     __table_args__ = (
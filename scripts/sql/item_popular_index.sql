@@ -0,0 +1,19 @@
+-- 인기 상품 추천(_get_popular_items) 조회용 인덱스
+-- - item 테이블은 Spring Boot 서비스가 관리하므로 DB에 직접 한 번 적용
+--   psql "$DATABASE_URL" -f scripts/sql/item_popular_index.sql
+-- - CONCURRENTLY 는 트랜잭션 블록 안에서 실행할 수 없으므로 psql 기본(autocommit) 모드로 실행
+
+-- item_status = 'BIDDING' AND end_time > now AND created_at > :three_days_ago
+-- ORDER BY bid_count DESC, view_count DESC LIMIT :n
+-- → 정렬 순서대로 인덱스를 읽다가 LIMIT 개수를 채우면 중단 (전체 정렬 불필요)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_item_popular_bidding
+    ON item (bid_count DESC, view_count DESC)
+    WHERE item_status = 'BIDDING';
+
+-- 적용 확인 (Index Scan using ix_item_popular_bidding 이 보이고 Sort 노드가 없으면 정상)
+-- EXPLAIN ANALYZE
+-- SELECT item_id FROM item
+-- WHERE item_status = 'BIDDING' AND end_time > now()
+--   AND created_at > now() - interval '3 days'
+-- ORDER BY bid_count DESC, view_count DESC
+-- LIMIT 20;
@@ -0,0 +1,21 @@
+-- 시세 추천(get_auction_prices) 낙찰가 조회용 인덱스
+-- - item 테이블은 Spring Boot 서비스가 관리하므로 DB에 직접 한 번 적용
+--   psql "$DATABASE_URL" -f scripts/sql/item_search_indexes.sql
+-- - CONCURRENTLY 는 트랜잭션 블록 안에서 실행할 수 없으므로 psql 기본(autocommit) 모드로 실행
+
+-- name ILIKE '%키워드%' (앞쪽 와일드카드) 검색을 인덱스로 처리
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_item_name_trgm
+    ON item USING gin (name gin_trgm_ops);
+
+-- item_status = 'SUCCESS' AND created_at > :threshold AND current_price > 0
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_item_status_created
+    ON item (item_status, created_at DESC)
+    WHERE current_price > 0;
+
+-- 적용 확인 (Bitmap Index Scan on ix_item_name_trgm 이 보이면 정상)
+-- EXPLAIN ANALYZE
+-- SELECT current_price FROM item
+-- WHERE item_status = 'SUCCESS' AND name ILIKE '%아이폰%'
+--   AND created_at > now() - interval '30 days' AND current_price > 0;
@@ -1,11 +1,20 @@
+import asyncio
+import hashlib
+import logging
 import mimetypes
 import os
+import shutil
+import struct
 import tempfile
-from typing import Tuple, List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, BinaryIO, Dict, Tuple, List, Optional
 
+from cachetools import TTLCache
 from gradio_client import Client, file as gradio_file
 
-from utils.storage import upload_bytes
+from utils.storage import upload_fileobj
+
+logger = logging.getLogger(__name__)
 
 HF_SPACE_ID = os.getenv("HF_SPACE_ID", "yisol/IDM-VTON")
 HF_REQUEST_TIMEOUT = int(os.getenv("HF_REQUEST_TIMEOUT", "600"))
@@ -13,6 +22,26 @@ HF_REQUEST_TIMEOUT = int(os.getenv("HF_REQUEST_TIMEOUT", "600"))
 # 여러 토큰을 콤마로 구분해 받을 수 있도록 지원 (HF_API_TOKENS 우선)
 _hf_tokens_raw = os.getenv("HF_API_TOKENS") or os.getenv("HF_API_TOKEN") or ""
 HF_API_TOKENS: List[str] = [t.strip() for t in _hf_tokens_raw.split(",") if t.strip()]
+# 토큰이 없으면 익명 호출 시도 (공개 Space인 경우만 동작)
+_TOKENS: List[Optional[str]] = list(HF_API_TOKENS) or [None]
+
+# ZeroGPU 쿼터는 토큰 단위로 소모되므로 토큰별 동시 호출 수 제한 (기본 1건)
+HF_TOKEN_CONCURRENCY = int(os.getenv("HF_TOKEN_CONCURRENCY", "1"))
+_token_semaphores: Dict[Optional[str], asyncio.Semaphore] = {
+    token: asyncio.Semaphore(HF_TOKEN_CONCURRENCY) for token in _TOKENS
+}
+
+# 토큰별 Client 재사용 (생성 시 Space 핸드셰이크/스키마 조회 비용을 매 요청마다 내지 않도록)
+_clients: Dict[Optional[str], Client] = {}
+# 워밍업과 첫 요청이 동시에 같은 토큰의 Client를 만들지 않도록 토큰별 잠금
+_client_locks: Dict[Optional[str], asyncio.Lock] = {token: asyncio.Lock() for token in _TOKENS}
+
+# 동일 입력(이미지 + 옵션) 재요청 시 HF 호출 없이 이전 결과 URL 재사용 (S3 URL은 영구)
+TRYON_CACHE_TTL = int(os.getenv("TRYON_CACHE_TTL", "3600"))
+_result_cache: TTLCache = TTLCache(maxsize=1024, ttl=TRYON_CACHE_TTL)
+
+# 입력 이미지는 tmpfs(/dev/shm)에 기록해 디스크 I/O를 피함 (없는 환경은 기본 임시 디렉토리)
+_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
 
 
 def _make_client(token: Optional[str]) -> Client:
@@ -22,28 +51,109 @@ def _make_client(token: Optional[str]) -> Client:
     return Client(HF_SPACE_ID, **kwargs)
 
 
-def _write_temp_file(data: bytes, filename: str | None) -> str:
+async def _get_client(token: Optional[str]) -> Client:
+    client = _clients.get(token)
+    if client is None:
+        async with _client_locks[token]:
+            client = _clients.get(token)
+            if client is None:
+                # Client 생성은 블로킹 HTTP 호출이므로 스레드에서 수행
+                client = await asyncio.to_thread(_make_client, token)
+                _clients[token] = client
+    return client
+
+
+async def warm_up_clients() -> None:
+    """
+    서버 시작 시 토큰별 Client를 미리 생성 (Space 핸드셰이크/API 스키마 조회)
+
+    첫 가상 피팅 요청이 핸드셰이크 비용을 내지 않도록 하기 위함이며,
+    실패해도 요청 시점에 다시 생성하므로 로그만 남김
+    """
+    results = await asyncio.gather(
+        *(_get_client(token) for token in _TOKENS), return_exceptions=True
+    )
+    failed = [r for r in results if isinstance(r, BaseException)]
+    for error in failed:
+        logger.warning("Hugging Face Client 워밍업 실패: %s", error)
+    logger.info("Hugging Face Client 워밍업 완료: %s/%s", len(results) - len(failed), len(results))
+
+
+def _file_digest(fileobj: BinaryIO) -> bytes:
+    fileobj.seek(0)
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        h.update(chunk)
+    return h.digest()
+
+
+def _fingerprint(
+    background_file: BinaryIO,
+    garment_file: BinaryIO,
+    garment_desc: str,
+    is_checked: bool,
+    crop: bool,
+    denoise_steps: int,
+    seed: int,
+) -> str:
+    """입력 이미지 내용과 호출 옵션으로 결과 캐시 키 생성"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_file_digest(background_file))
+    h.update(_file_digest(garment_file))
+    h.update(struct.pack("<??qq", is_checked, crop, denoise_steps, seed))
+    h.update(garment_desc.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _write_temp_input_file(fileobj: BinaryIO, filename: str | None) -> str:
     suffix = ""
     if filename and "." in filename:
         suffix = os.path.splitext(filename)[1]
-    fd, path = tempfile.mkstemp(suffix=suffix or ".png")
-    with os.fdopen(fd, "wb") as f:
-        f.write(data)
+    fileobj.seek(0)
+    fd, path = tempfile.mkstemp(suffix=suffix or ".png", prefix="tryon-", dir=_TEMP_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # 업로드 파일 전체를 bytes로 읽지 않고 청크 단위로 복사
+            shutil.copyfileobj(fileobj, f)
+    except BaseException:
+        _remove_file(path)
+        raise
     return path
 
 
-def _to_data_url_from_path(path: str) -> str:
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+@asynccontextmanager
+async def _temp_input_file(fileobj: BinaryIO, filename: str | None) -> AsyncIterator[str]:
+    # 업로드 파일이 디스크로 넘어가 있을 수 있으므로 복사/삭제는 스레드에서 수행 (이벤트 루프 블로킹 방지)
+    path = await asyncio.to_thread(_write_temp_input_file, fileobj, filename)
+    try:
+        yield path
+    finally:
+        await asyncio.to_thread(_remove_file, path)
+
+
+def _upload_output_file(path: str, prefix: str) -> str:
     mime = mimetypes.guess_type(path)[0] or "image/png"
     with open(path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode("utf-8")
-    return f"data:{mime};base64,{encoded}"
+        return upload_fileobj(
+            f,
+            prefix=prefix,
+            filename=os.path.basename(path),
+            content_type=mime,
+        )
 
 
-def run_virtual_tryon(
-    background_bytes: bytes,
+async def run_virtual_tryon(
+    background_file: BinaryIO,
     background_content_type: str | None,
     background_filename: str | None,
-    garment_bytes: bytes,
+    garment_file: BinaryIO,
     garment_content_type: str | None,
     garment_filename: str | None,
     garment_desc: str,
@@ -52,80 +162,69 @@ def run_virtual_tryon(
     denoise_steps: int = 30,
     seed: int = 42,
 ) -> Tuple[str, str | None]:
-    if not HF_API_TOKENS:
-        # 토큰이 없으면 익명 호출 시도 (공개 Space인 경우만 동작)
-        tokens_to_try: List[Optional[str]] = [None]
-    else:
-        tokens_to_try = [t for t in HF_API_TOKENS]
+    # 같은 입력으로 이미 생성한 결과가 있으면 바로 반환
+    cache_key = await asyncio.to_thread(
+        _fingerprint,
+        background_file,
+        garment_file,
+        garment_desc,
+        is_checked,
+        crop,
+        denoise_steps,
+        seed,
+    )
+    cached = _result_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    bg_path = _write_temp_file(background_bytes, background_filename)
-    garment_path = _write_temp_file(garment_bytes, garment_filename)
+    # 다른 요청이 사용 중이지 않은 토큰부터 시도, 모두 사용 중이면 순서대로 대기
+    tokens_to_try = [t for t in _TOKENS if not _token_semaphores[t].locked()] or _TOKENS
 
     last_error: Optional[Exception] = None
 
-    try:
+    async with _temp_input_file(background_file, background_filename) as bg_path, \
+            _temp_input_file(garment_file, garment_filename) as garment_path:
         for token in tokens_to_try:
-            client = _make_client(token)
-            try:
-                # submit으로 job을 만들고, HF_REQUEST_TIMEOUT(초) 만큼만 대기
-                job = client.submit(
-                    dict={"background": gradio_file(bg_path), "layers": [], "composite": None},
-                    garm_img=gradio_file(garment_path),
-                    garment_des=garment_desc,
-                    is_checked=is_checked,
-                    is_checked_crop=crop,
-                    denoise_steps=denoise_steps,
-                    seed=seed,
-                    api_name="/tryon",
-                )
-                result = job.result(timeout=HF_REQUEST_TIMEOUT)
-                break  # 성공하면 루프 종료
-            except Exception as exc:
-                last_error = exc
-                msg = str(exc)
-                # ZeroGPU 쿼터 초과 같은 경우에만 다음 토큰으로 넘어감
-                if "ZeroGPU" in msg or "quota" in msg:
-                    continue
-                # 그 외 에러는 바로 중단
-                raise
+            async with _token_semaphores[token]:
+                client = await _get_client(token)
+                try:
+                    # submit으로 job을 만들고, 이벤트 루프에서 HF_REQUEST_TIMEOUT(초) 만큼만 대기
+                    job = client.submit(
+                        dict={"background": gradio_file(bg_path), "layers": [], "composite": None},
+                        garm_img=gradio_file(garment_path),
+                        garment_des=garment_desc,
+                        is_checked=is_checked,
+                        is_checked_crop=crop,
+                        denoise_steps=denoise_steps,
+                        seed=seed,
+                        api_name="/tryon",
+                    )
+                    result = await asyncio.wait_for(asyncio.wrap_future(job), timeout=HF_REQUEST_TIMEOUT)
+                    break  # 성공하면 루프 종료
+                except Exception as exc:
+                    last_error = exc
+                    msg = str(exc)
+                    # ZeroGPU 쿼터 초과 같은 경우에만 다음 토큰으로 넘어감
+                    if "ZeroGPU" in msg or "quota" in msg:
+                        continue
+                    # 그 외 에러(연결 끊김 등)는 Client를 폐기해 다음 요청에서 새로 연결하고 중단
+                    _clients.pop(token, None)
+                    raise
         else:
             # 모든 토큰이 실패한 경우
             raise RuntimeError(f"Hugging Face 호출 실패 (모든 토큰 소진): {last_error}")
-    finally:
-        try:
-            os.remove(bg_path)
-        except OSError:
-            pass
-        try:
-            os.remove(garment_path)
-        except OSError:
-            pass
 
     output_path, masked_path = result
 
-    # 결과 이미지를 읽어서 S3에 업로드
-    with open(output_path, "rb") as f:
-        output_bytes = f.read()
-    output_mime = mimetypes.guess_type(output_path)[0] or "image/png"
-    result_url = upload_bytes(
-        output_bytes,
-        prefix="tryon/results",
-        filename=os.path.basename(output_path),
-        content_type=output_mime,
-    )
-
-    masked_url: str | None = None
+    # 결과 이미지를 메모리에 읽지 않고 파일 핸들 그대로 S3에 스트리밍 업로드
+    # (결과/마스크 이미지는 서로 독립적이므로 동시에 업로드)
+    uploads = [asyncio.to_thread(_upload_output_file, output_path, "tryon/results")]
     if masked_path:
-        with open(masked_path, "rb") as f:
-            masked_bytes = f.read()
-        masked_mime = mimetypes.guess_type(masked_path)[0] or "image/png"
-        masked_url = upload_bytes(
-            masked_bytes,
-            prefix="tryon/masked",
-            filename=os.path.basename(masked_path),
-            content_type=masked_mime,
-        )
-
-    return result_url, masked_url
+        uploads.append(asyncio.to_thread(_upload_output_file, masked_path, "tryon/masked"))
+    urls = await asyncio.gather(*uploads)
 
+    result_url = urls[0]
+    masked_url: str | None = urls[1] if masked_path else None
 
+    _result_cache[cache_key] = (result_url, masked_url)
+    return result_url, masked_url
@@ -14,6 +14,16 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME")
 
+# 커넥션 풀 설정
+# - DB_POOL_PRE_PING: 체크아웃마다 SELECT 1 로 연결 확인 (죽은 연결 방지, 대신 체크아웃당 1회 왕복 추가)
+#   PgBouncer(transaction 모드) 앞단에서는 false + 짧은 DB_POOL_RECYCLE(예: 60) 권장
+# - DB_POOL_RECYCLE: 해당 시간(초)이 지난 연결은 재생성 (RDS/프록시 유휴 타임아웃보다 짧게)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+
 # MySQL 연결 문자열 생성
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
@@ -21,9 +31,15 @@ DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NA
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # SQL 쿼리 로그 출력 (개발 시 True, 운영 시 False)
-    pool_pre_ping=True,  # 연결 유효성 자동 검사
-    pool_size=10,  # 연결 풀 크기
-    max_overflow=20  # 최대 추가 연결 수
+    pool_pre_ping=DB_POOL_PRE_PING,  # 연결 유효성 자동 검사
+    pool_recycle=DB_POOL_RECYCLE,  # 오래된 연결 재생성 주기(초)
+    pool_size=DB_POOL_SIZE,  # 연결 풀 크기
+    max_overflow=DB_MAX_OVERFLOW,  # 최대 추가 연결 수
+    pool_timeout=DB_POOL_TIMEOUT,  # 풀 고갈 시 연결 대기 시간(초)
+    # 다건 INSERT는 multi-VALUES 한 문장으로(insertmanyvalues), 다건 UPDATE/DELETE는 execute_batch로 묶어 전송
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
 )
 
 # 세션 팩토리 생성
@@ -8,18 +8,34 @@
 - DB에 결과 저장/업데이트
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, List
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from models.db_models import MarketPriceDB, ItemDB
+from sqlalchemy import or_, and_, select
+from sqlalchemy.dialects.postgresql import insert
+from models.db_models import MarketPriceDB, ItemDB, utc_now
 from models.enums import CategoryEnum, ItemStatusEnum
 from utils.price_crawler_selenium import crawl_with_fallback_selenium
 from utils.price_ai import PriceAI
+from utils.database import SessionLocal
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 프로세스 내 시세 결과 캐시 (짧은 TTL 동안 같은 키워드 재요청은 DB 조회 없이 응답)
+# - 키: (keyword, category), 값: get_or_crawl 결과 dict
+# - 스레드풀에서 호출되므로 잠금으로 보호
+PRICE_RESULT_CACHE_TTL = int(os.getenv("PRICE_RESULT_CACHE_TTL", "60"))
+_result_cache: TTLCache = TTLCache(maxsize=1024, ttl=PRICE_RESULT_CACHE_TTL)
+_result_cache_lock = threading.Lock()
+
+# 크롤링과 동시에 낙찰 데이터를 미리 조회하기 위한 스레드 풀
+_auction_query_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="auction-prices")
+
 
 class MarketPriceService:
     """시세 서비스"""
@@ -47,18 +63,29 @@ class MarketPriceService:
         """
         threshold = datetime.utcnow() - timedelta(days=self.auction_days)
 
-        # item_status = COMPLETED인 낙찰 완료 상품 조회
-        completed_items = db.query(ItemDB).filter(
+        # item_status = COMPLETED인 낙찰 완료 상품의 낙찰가 컬럼만 조회
+        # (NULL/0 가격도 DB에서 제외 → ORM 객체 생성 없이 가격만 전송)
+        # - yield_per: 서버 사이드 커서로 1000건씩 받아 결과 전체를 한 번에 버퍼링하지 않음
+        stmt = select(ItemDB.current_price).where(
             ItemDB.item_status == ItemStatusEnum.SUCCESS,
             ItemDB.name.ilike(f"%{keyword}%"),  # 부분 매칭
-            ItemDB.created_at > threshold
-        ).all()
+            ItemDB.created_at > threshold,
+            ItemDB.current_price > 0
+        ).execution_options(yield_per=1000)
 
-        prices = [item.current_price for item in completed_items if item.current_price]
+        prices = list(db.execute(stmt).scalars())
 
         logger.info(f"낙찰 데이터: '{keyword}' 키워드로 {len(prices)}개 발견 (최근 {self.auction_days}일)")
         return prices
 
+    def _get_auction_prices_in_new_session(self, keyword: str) -> List[int]:
+        """별도 스레드에서 실행하기 위한 낙찰가 조회 (세션은 스레드 간 공유 불가 → 전용 세션 사용)"""
+        db = SessionLocal()
+        try:
+            return self.get_auction_prices(db, keyword)
+        finally:
+            db.close()
+
     def get_cached_price(self, db: Session, keyword: str) -> Optional[dict]:
         """
         DB 캐시에서 시세 조회
@@ -121,6 +148,11 @@ class MarketPriceService:
         """
         logger.info(f"실시간 데이터 수집 시작: {keyword}")
 
+        # 낙찰 데이터는 원래 키워드로 크롤링과 동시에 미리 조회 (키워드 축소가 없으면 그대로 사용)
+        speculative_auction = _auction_query_executor.submit(
+            self._get_auction_prices_in_new_session, keyword
+        )
+
         # 1. 중고나라 크롤링 실행 (키워드 축소 재시도 포함)
         crawl_results = crawl_with_fallback_selenium(keyword, min_samples=3)
         joongna_prices = crawl_results.get("joongna", [])
@@ -129,7 +161,17 @@ class MarketPriceService:
         logger.info(f"중고나라 크롤링: {len(joongna_prices)}개 가격 수집")
 
         # 2. 실제 낙찰 데이터 조회 (최근 30일)
-        auction_prices = self.get_auction_prices(db, final_keyword)
+        auction_prices = None
+        if final_keyword == keyword:
+            try:
+                auction_prices = speculative_auction.result()
+            except Exception as e:
+                logger.warning(f"낙찰 데이터 선조회 실패, 다시 조회: {e}")
+        else:
+            speculative_auction.cancel()
+
+        if auction_prices is None:
+            auction_prices = self.get_auction_prices(db, final_keyword)
         logger.info(f"실제 낙찰 데이터: {len(auction_prices)}개 발견")
 
         # 3. 두 데이터 소스 통합
@@ -173,6 +215,10 @@ class MarketPriceService:
         self._save_to_db(db, final_keyword, "joongna", joongna_stats)
         db.commit()
 
+        # 축소 키워드의 시세가 갱신됐으므로 해당 키워드의 결과 캐시는 무효화
+        with _result_cache_lock:
+            _result_cache.pop((final_keyword, category), None)
+
         logger.info(f"실시간 데이터 수집 완료: {keyword} -> {final_keyword} (추천가: {suggested_price:,}원)")
 
         return {
@@ -180,9 +226,7 @@ class MarketPriceService:
             "auction_stats": auction_stats,
             "combined_stats": combined_stats,
             "suggested_start_price": suggested_price,
-            "category_ratio": self.price_ai.CATEGORY_RATIOS.get(
-                category, self.price_ai.DEFAULT_RATIO
-            ),
+            "category_ratio": self.price_ai.get_category_ratio(category),
             "final_keyword": final_keyword,
             "data_source": {
                 "crawl_count": len(joongna_prices),
@@ -211,33 +255,29 @@ class MarketPriceService:
             logger.warning(f"저장 스킵: {platform} - 데이터 없음")
             return
 
-        # 기존 레코드 조회
-        existing = db.query(MarketPriceDB).filter(
-            MarketPriceDB.keyword == keyword,
-            MarketPriceDB.platform == platform
-        ).first()
-
-        if existing:
-            # 업데이트
-            existing.avg_price = stats.get("avg_price")
-            existing.min_price = stats.get("min_price")
-            existing.max_price = stats.get("max_price")
-            existing.sample_count = stats.get("sample_count")
-            existing.crawled_at = datetime.utcnow()
-            logger.info(f"DB 업데이트: {platform} - {keyword}")
-        else:
-            # 신규 생성
-            new_record = MarketPriceDB(
-                keyword=keyword,
-                platform=platform,
-                avg_price=stats.get("avg_price"),
-                min_price=stats.get("min_price"),
-                max_price=stats.get("max_price"),
-                sample_count=stats.get("sample_count"),
-                crawled_at=datetime.utcnow()
-            )
-            db.add(new_record)
-            logger.info(f"DB 생성: {platform} - {keyword}")
+        # 단일 INSERT ... ON CONFLICT DO UPDATE (조회 후 갱신/생성하던 2회 왕복을 1회로)
+        # - (keyword, platform) 유니크 제약 기준 (제약 이름과 무관하게 컬럼으로 지정)
+        stmt = insert(MarketPriceDB).values(
+            keyword=keyword,
+            platform=platform,
+            avg_price=stats.get("avg_price"),
+            min_price=stats.get("min_price"),
+            max_price=stats.get("max_price"),
+            sample_count=stats.get("sample_count"),
+            crawled_at=utc_now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MarketPriceDB.keyword, MarketPriceDB.platform],
+            set_={
+                "avg_price": stmt.excluded.avg_price,
+                "min_price": stmt.excluded.min_price,
+                "max_price": stmt.excluded.max_price,
+                "sample_count": stmt.excluded.sample_count,
+                "crawled_at": stmt.excluded.crawled_at,
+            },
+        )
+        db.execute(stmt)
+        logger.info(f"DB 저장(UPSERT): {platform} - {keyword}")
 
     def get_or_crawl(
         self,
@@ -256,6 +296,28 @@ class MarketPriceService:
         Returns:
             처리 결과 (통계 + 추천가)
         """
+        # 0. 프로세스 내 결과 캐시 조회
+        cache_key = (keyword, category)
+        with _result_cache_lock:
+            result = _result_cache.get(cache_key)
+        if result is not None:
+            logger.info(f"결과 캐시 히트: {keyword}")
+            # 캐시에 보관한 dict 는 공유되므로 호출자마다 복사본을 돌려줌
+            return {**result, "from_cache": True}
+
+        result = self._get_or_crawl(db, keyword, category)
+        # 반환한 dict 를 호출자가 수정해도 캐시 값이 바뀌지 않도록 복사해서 보관
+        with _result_cache_lock:
+            _result_cache[cache_key] = dict(result)
+        return result
+
+    def _get_or_crawl(
+        self,
+        db: Session,
+        keyword: str,
+        category: Optional[CategoryEnum] = None
+    ) -> dict:
+        """get_or_crawl 본체 (DB 캐시 조회 → 미스 시 실시간 크롤링)"""
         # 1. 캐시 조회
         cached = self.get_cached_price(db, keyword)
 
@@ -266,19 +328,19 @@ class MarketPriceService:
             # 실시간 낙찰 데이터 조회 (항상 최신 데이터)
             auction_prices = self.get_auction_prices(db, keyword)
 
-            # 통합 평균 계산
-            all_prices = []
+            # 통합 평균 계산 (가격, 반복 횟수) - 캐시 평균을 샘플 수만큼 펼치지 않고 가중치로 전달
+            prices = list(auction_prices)  # 실시간 낙찰 데이터
+            weights = [1] * len(auction_prices)
 
             # 캐시된 크롤링 데이터 (가중 평균)
             if joongna_stats and joongna_stats.get("avg_price"):
-                count = joongna_stats.get("sample_count", 1)
-                all_prices.extend([joongna_stats["avg_price"]] * count)
+                prices.append(joongna_stats["avg_price"])
+                weights.append(joongna_stats.get("sample_count", 1))
 
-            # 실시간 낙찰 데이터
-            all_prices.extend(auction_prices)
+            total_count = sum(weights)
 
-            if all_prices:
-                _, combined_stats = self.price_ai.remove_outliers_iqr(all_prices)
+            if total_count:
+                combined_stats = self.price_ai.weighted_iqr_stats(prices, weights)
                 avg_price = combined_stats["avg_price"]
                 suggested_price = self.price_ai.calculate_start_price(avg_price, category)
 
@@ -294,15 +356,13 @@ class MarketPriceService:
                     "auction_stats": auction_stats,
                     "combined_stats": combined_stats,
                     "suggested_start_price": suggested_price,
-                    "category_ratio": self.price_ai.CATEGORY_RATIOS.get(
-                        category, self.price_ai.DEFAULT_RATIO
-                    ),
+                    "category_ratio": self.price_ai.get_category_ratio(category),
                     "from_cache": True,
                     "final_keyword": keyword,
                     "data_source": {
                         "crawl_count": joongna_stats.get("sample_count", 0),
                         "auction_count": len(auction_prices),
-                        "total_count": len(all_prices)
+                        "total_count": total_count
                     }
                 }
 
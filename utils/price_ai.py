@@ -4,29 +4,60 @@ AI 가격 추천 로직
 - 카테고리별 시작가 계산
 """
 
+from types import MappingProxyType
+
 import numpy as np
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 from models.enums import CategoryEnum
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _sorted_percentile(sorted_values: np.ndarray, q: float) -> float:
+    """정렬된 배열에서 백분위수 계산 (np.percentile의 linear 방식과 동일, 재정렬 없음)"""
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return float(sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo))
+
+
+def _weighted_sorted_percentile(sorted_values: np.ndarray, cum_weights: np.ndarray, q: float) -> float:
+    """
+    가중치(반복 횟수)가 있는 정렬된 값에서 백분위수 계산
+
+    값을 가중치만큼 펼친 배열에 np.percentile(linear)을 적용한 것과 같은 결과를
+    실제로 펼치지 않고 누적 가중치에서 위치를 찾아 계산
+    """
+    total = int(cum_weights[-1])
+    pos = (total - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, total - 1)
+    v_lo = sorted_values[np.searchsorted(cum_weights, lo, side="right")]
+    v_hi = sorted_values[np.searchsorted(cum_weights, hi, side="right")]
+    return float(v_lo + (v_hi - v_lo) * (pos - lo))
+
+
 class PriceAI:
     """가격 추천 AI"""
 
     # 카테고리별 시작가 비율
-    CATEGORY_RATIOS = {
+    # (읽기 전용 매핑으로 고정 - 런타임 중 실수로 변경되지 않도록)
+    CATEGORY_RATIOS = MappingProxyType({
         CategoryEnum.DIGITAL: 0.92,  # 디지털 기기 - 시세 안정적
         CategoryEnum.CLOTHES: 0.85,  # 의류 - 주관적 가치, 빠른 판매
         CategoryEnum.HOME_APPLIANCE: 0.90,  # 가전 - 실용성 위주
         CategoryEnum.BEAUTY: 0.85,  # 화장품 - 빠른 판매
         CategoryEnum.SPORTS: 0.88,  # 스포츠 용품
-        CategoryEnum.DIGITAL: 0.92,  # 디지털
-    }
+    })
 
     DEFAULT_RATIO = 0.90  # 기본 비율
 
+    @staticmethod
+    def get_category_ratio(category: Optional[CategoryEnum]) -> float:
+        """카테고리별 시작가 비율 (없으면 기본 비율)"""
+        return PriceAI.CATEGORY_RATIOS.get(category, PriceAI.DEFAULT_RATIO)
+
     def remove_outliers_iqr(self, prices: List[int]) -> Tuple[List[int], dict]:
         """
         IQR 방식으로 이상치 제거
@@ -37,53 +68,143 @@ class PriceAI:
         Returns:
             (필터링된 가격 리스트, 통계 정보)
         """
+        filtered_array, stats = self._remove_outliers_iqr_array(np.asarray(prices, dtype=np.int64))
+        return filtered_array.tolist(), stats
+
+    def _remove_outliers_iqr_array(self, prices: np.ndarray) -> Tuple[np.ndarray, dict]:
+        """
+        remove_outliers_iqr 의 ndarray 버전 (필터링 결과도 ndarray로 반환, 리스트 변환 없음)
+
+        Args:
+            prices: 가격 배열
+
+        Returns:
+            (필터링된 가격 배열 - 오름차순, 통계 정보)
+        """
         if len(prices) < 3:
             # 샘플이 너무 적으면 그대로 반환
             logger.warning(f"샘플 수 부족 ({len(prices)}개), 이상치 제거 스킵")
             return prices, self._calculate_stats(prices)
 
-        prices_array = np.array(prices)
+        # 한 번만 정렬해두고 사분위수/필터링/최솟값·최댓값 모두 정렬된 배열에서 계산
+        sorted_prices = np.sort(prices)
 
-        # Q1, Q3 계산
-        q1 = np.percentile(prices_array, 25)
-        q3 = np.percentile(prices_array, 75)
+        # Q1, Q3 계산 (np.percentile 기본값과 같은 선형 보간)
+        q1 = _sorted_percentile(sorted_prices, 25)
+        q3 = _sorted_percentile(sorted_prices, 75)
         iqr = q3 - q1
 
         # 유효 범위 계산
         lower_bound = q1 - 1.5 * iqr
         upper_bound = q3 + 1.5 * iqr
 
-        # 필터링
-        filtered_prices = [p for p in prices if lower_bound <= p <= upper_bound]
+        # 필터링 (정렬된 배열이므로 유효 범위는 연속 구간 → 이진 탐색으로 슬라이스)
+        lo = np.searchsorted(sorted_prices, lower_bound, side="left")
+        hi = np.searchsorted(sorted_prices, upper_bound, side="right")
+        filtered_array = sorted_prices[lo:hi]
 
         logger.info(
-            f"IQR 이상치 제거: {len(prices)}개 -> {len(filtered_prices)}개 "
+            f"IQR 이상치 제거: {len(prices)}개 -> {len(filtered_array)}개 "
             f"(범위: {int(lower_bound):,}원 ~ {int(upper_bound):,}원)"
         )
 
-        stats = self._calculate_stats(filtered_prices)
+        stats = self._calculate_stats(filtered_array, is_sorted=True)
         stats.update({
             "q1": int(q1),
             "q3": int(q3),
             "iqr": int(iqr),
             "lower_bound": int(lower_bound),
             "upper_bound": int(upper_bound),
-            "removed_count": len(prices) - len(filtered_prices)
+            "removed_count": len(prices) - len(filtered_array)
         })
 
-        return filtered_prices, stats
+        return filtered_array, stats
 
-    def _calculate_stats(self, prices: List[int]) -> dict:
+    def weighted_iqr_stats(self, prices: List[int], weights: List[int]) -> dict:
         """
-        가격 통계 계산
+        가중치(반복 횟수)가 있는 가격으로 IQR 이상치 제거 후 통계 계산
+
+        캐시된 평균 시세처럼 "같은 값 N개"를 리스트로 펼치지 않고
+        remove_outliers_iqr(펼친 리스트)와 같은 통계를 계산
 
         Args:
             prices: 가격 리스트
+            weights: 각 가격의 반복 횟수
+
+        Returns:
+            통계 정보 (remove_outliers_iqr 와 같은 형식)
+        """
+        values = np.asarray(prices)
+        counts = np.asarray(weights, dtype=np.int64)
+        order = np.argsort(values, kind="stable")
+        values, counts = values[order], counts[order]
+        total = int(counts.sum())
+
+        if total == 0:
+            return self._calculate_stats([])
+
+        if total < 3:
+            # 샘플이 너무 적으면 이상치 제거 없이 통계만 계산
+            logger.warning(f"샘플 수 부족 ({total}개), 이상치 제거 스킵")
+            return {
+                "avg_price": int((values * counts).sum() / total),
+                "min_price": int(values[0]),
+                "max_price": int(values[-1]),
+                "sample_count": total
+            }
+
+        # Q1, Q3 계산 (펼친 배열 기준 선형 보간)
+        cum_counts = np.cumsum(counts)
+        q1 = _weighted_sorted_percentile(values, cum_counts, 25)
+        q3 = _weighted_sorted_percentile(values, cum_counts, 75)
+        iqr = q3 - q1
+
+        # 유효 범위 계산
+        lower_bound = q1 - 1.5 * iqr
+        upper_bound = q3 + 1.5 * iqr
+
+        # 필터링 (정렬된 값이므로 연속 구간)
+        lo = np.searchsorted(values, lower_bound, side="left")
+        hi = np.searchsorted(values, upper_bound, side="right")
+        kept_values, kept_counts = values[lo:hi], counts[lo:hi]
+        kept_total = int(kept_counts.sum())
+
+        logger.info(
+            f"IQR 이상치 제거(가중): {total}개 -> {kept_total}개 "
+            f"(범위: {int(lower_bound):,}원 ~ {int(upper_bound):,}원)"
+        )
+
+        if kept_total == 0:
+            stats = self._calculate_stats([])
+        else:
+            stats = {
+                "avg_price": int((kept_values * kept_counts).sum() / kept_total),
+                "min_price": int(kept_values[0]),
+                "max_price": int(kept_values[-1]),
+                "sample_count": kept_total
+            }
+        stats.update({
+            "q1": int(q1),
+            "q3": int(q3),
+            "iqr": int(iqr),
+            "lower_bound": int(lower_bound),
+            "upper_bound": int(upper_bound),
+            "removed_count": total - kept_total
+        })
+        return stats
+
+    def _calculate_stats(self, prices: Union[List[int], np.ndarray], is_sorted: bool = False) -> dict:
+        """
+        가격 통계 계산
+
+        Args:
+            prices: 가격 리스트 또는 ndarray
+            is_sorted: 오름차순 정렬 여부 (True면 최솟값/최댓값을 양 끝에서 바로 읽음)
 
         Returns:
             통계 정보 딕셔너리
         """
-        if not prices:
+        if len(prices) == 0:
             return {
                 "avg_price": None,
                 "min_price": None,
@@ -91,11 +212,12 @@ class PriceAI:
                 "sample_count": 0
             }
 
+        prices_array = np.asarray(prices)
         return {
-            "avg_price": int(np.mean(prices)),
-            "min_price": int(np.min(prices)),
-            "max_price": int(np.max(prices)),
-            "sample_count": len(prices)
+            "avg_price": int(prices_array.mean()),
+            "min_price": int(prices_array[0] if is_sorted else prices_array.min()),
+            "max_price": int(prices_array[-1] if is_sorted else prices_array.max()),
+            "sample_count": len(prices_array)
         }
 
     def calculate_start_price(
@@ -114,7 +236,7 @@ class PriceAI:
             추천 시작가 (천원 단위 반올림)
         """
         # 카테고리별 비율 적용
-        ratio = self.CATEGORY_RATIOS.get(category, self.DEFAULT_RATIO)
+        ratio = self.get_category_ratio(category)
 
         # 시작가 계산
         start_price = avg_price * ratio
@@ -153,30 +275,34 @@ class PriceAI:
             }
         """
         result = {}
+        # 플랫폼별 필터링 결과를 배열로 모아 한 번에 합침 (리스트 변환/확장 없음)
+        filtered_arrays = []
 
         # 중고나라 처리
         if joongna_prices:
-            filtered_joongna, joongna_stats = self.remove_outliers_iqr(joongna_prices)
+            filtered_joongna, joongna_stats = self._remove_outliers_iqr_array(
+                np.asarray(joongna_prices, dtype=np.int64)
+            )
+            filtered_arrays.append(filtered_joongna)
             result["joongna_stats"] = joongna_stats
         else:
             result["joongna_stats"] = self._calculate_stats([])
 
         # 당근마켓 처리
         if daangn_prices:
-            filtered_daangn, daangn_stats = self.remove_outliers_iqr(daangn_prices)
+            filtered_daangn, daangn_stats = self._remove_outliers_iqr_array(
+                np.asarray(daangn_prices, dtype=np.int64)
+            )
+            filtered_arrays.append(filtered_daangn)
             result["daangn_stats"] = daangn_stats
         else:
             result["daangn_stats"] = self._calculate_stats([])
 
         # 전체 통합 평균 계산
-        all_filtered_prices = []
-        if joongna_prices:
-            all_filtered_prices.extend(filtered_joongna)
-        if daangn_prices:
-            all_filtered_prices.extend(filtered_daangn)
+        all_filtered_prices = np.concatenate(filtered_arrays) if filtered_arrays else np.empty(0, dtype=np.int64)
 
-        if all_filtered_prices:
-            _, combined_stats = self.remove_outliers_iqr(all_filtered_prices)
+        if len(all_filtered_prices):
+            _, combined_stats = self._remove_outliers_iqr_array(all_filtered_prices)
             result["combined_stats"] = combined_stats
 
             # 추천 시작가 계산
@@ -184,7 +310,7 @@ class PriceAI:
             suggested_price = self.calculate_start_price(avg_price, category)
 
             result["suggested_start_price"] = suggested_price
-            result["category_ratio"] = self.CATEGORY_RATIOS.get(category, self.DEFAULT_RATIO)
+            result["category_ratio"] = self.get_category_ratio(category)
         else:
             result["combined_stats"] = self._calculate_stats([])
             result["suggested_start_price"] = None
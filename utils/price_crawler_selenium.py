@@ -1,25 +1,261 @@
 """
 중고 시세 크롤링 모듈 (Selenium 버전)
-- Selenium + Chrome WebDriver 사용
-- JavaScript 렌더링 지원
+- 1차: httpx로 검색 페이지 HTML만 받아 Next.js __NEXT_DATA__ JSON에서 가격 추출 (브라우저 불필요)
+- 2차(폴백): Selenium + Chrome WebDriver 사용 (JavaScript 렌더링 지원)
 """
 
+import json
+import os
+import platform
 import re
+import threading
 import time
-from typing import List, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
 import logging
 
+# selenium / webdriver_manager 는 실제로 Chrome을 띄울 때만 import
+# (HTTP 크롤링으로 끝나거나 시세 API를 쓰지 않는 프로세스는 import 비용/메모리를 내지 않음)
+if TYPE_CHECKING:
+    from selenium import webdriver
+
 logger = logging.getLogger(__name__)
 
 
+# 가격 텍스트 파싱용 정규식 (모듈 로드 시 한 번만 컴파일)
+_PAT_MAN_WON = re.compile(r'(\d+\.?\d*)만원')  # 49만원, 49.9만원
+_PAT_MAN = re.compile(r'(\d+\.?\d*)만')       # 49만, 49.9만
+_PAT_WON = re.compile(r'(\d+)원')               # 490000원
+_PAT_DIGITS = re.compile(r'(\d{4,})')           # 490000
+# 가격 텍스트에서 제거할 문자 (쉼표, 공백, 줄바꿈)
+_PRICE_STRIP_TABLE = str.maketrans('', '', ', \n')
+
+# 검색 페이지 HTML에 포함된 Next.js 초기 데이터
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+# __NEXT_DATA__ 상품 객체에서 가격/상품명으로 볼 키
+_NEXT_DATA_PRICE_KEYS = ("price", "salePrice", "productPrice")
+_NEXT_DATA_TITLE_KEYS = ("title", "productTitle", "name")
+
+# HTML 요청용 공유 클라이언트 (스레드 안전, 커넥션 재사용)
+_http_client = httpx.Client(
+    headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+    follow_redirects=True,
+)
+
+# 상품 카드 탐색 선택자 (앞에서부터 시도, 처음으로 요소가 잡히는 선택자 사용)
+_PRODUCT_SELECTORS = [
+    'a[href*="/product/"]',  # 상품 링크
+    'article',  # 상품 카드
+    'div[class*="item"]',  # 아이템 컨테이너
+    'div[class*="product"]',  # 제품 컨테이너
+    'li[class*="item"]',  # 리스트 아이템
+]
+
+# 상품 카드 텍스트 + 가격 후보 하위 요소 텍스트를 한 번에 수집하는 스크립트
+# 반환: {selector, total, cards: [{text, parts: [...]}, ...]} 또는 null (상품 없음)
+_SCRAPE_PRODUCTS_JS = """
+const [selectors, maxItems] = arguments;
+for (const selector of selectors) {
+    const elements = document.querySelectorAll(selector);
+    if (elements.length === 0) continue;
+    const cards = Array.from(elements).slice(0, maxItems).map(e => ({
+        text: e.innerText || '',
+        parts: Array.from(e.querySelectorAll('span, div, p, strong, b'), c => c.innerText || ''),
+    }));
+    return {selector: selector, total: elements.length, cards: cards};
+}
+return null;
+"""
+
+# 크롤링 시 로드하지 않을 리소스 URL 패턴
+# (스타일시트는 innerText/스크롤 높이 계산에 영향을 주므로 차단하지 않음)
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+]
+
+# 스크롤 후 추가 상품이 로드되기를 기다리는 최대 시간(초)
+_LAZY_LOAD_WAIT = 2
+
+# 키워드 축소 재시도 시 동시에 HTTP 크롤링할 키워드 수 + 제출 간격(초)
+# (Chrome 크롤링은 요청당 한 번에 하나씩만 실행되므로 드라이버 풀 크기와 무관)
+FALLBACK_PARALLELISM = int(os.getenv("CRAWL_FALLBACK_PARALLELISM", "3"))
+_FALLBACK_STAGGER_SECONDS = 0.1
+_fallback_executor = ThreadPoolExecutor(max_workers=FALLBACK_PARALLELISM * 2, thread_name_prefix="crawl-fallback")
+
+# 동시에 사용할 수 있는 Chrome 인스턴스 수 (FastAPI 스레드풀 워커가 나눠 씀)
+# - headless Chrome 하나가 수백 MB를 쓰므로 기본은 워커당 1개 (워커 수 x 풀 크기만큼 상주)
+SELENIUM_POOL_SIZE = int(os.getenv("SELENIUM_POOL_SIZE", "1"))
+# 이 시간(초) 동안 재사용되지 않은 Chrome 은 종료해 메모리 반환
+SELENIUM_IDLE_TIMEOUT = float(os.getenv("SELENIUM_IDLE_TIMEOUT", "60"))
+
+# ChromeDriver 실행 파일 경로 (프로세스당 한 번만 탐색)
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+# 재사용 대기 중인 (WebDriver, 반납 시각) 목록 (오래된 순) + 동시 사용 수 제한
+_idle_drivers: List[Tuple["webdriver.Chrome", float]] = []
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(SELENIUM_POOL_SIZE)
+
+
+def _find_next_data_prices(node: Any, prices: List[int], max_items: int) -> None:
+    """__NEXT_DATA__ JSON을 순회하며 상품 객체(상품명 + 가격 키를 가진 dict)의 가격 수집"""
+    if len(prices) >= max_items:
+        return
+    if isinstance(node, dict):
+        if any(key in node for key in _NEXT_DATA_TITLE_KEYS):
+            for key in _NEXT_DATA_PRICE_KEYS:
+                value = node.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                        and 1000 <= value <= 100000000:
+                    prices.append(int(value))
+                    return
+        for value in node.values():
+            _find_next_data_prices(value, prices, max_items)
+    elif isinstance(node, list):
+        for value in node:
+            _find_next_data_prices(value, prices, max_items)
+
+
+def _count_products(driver: "webdriver.Chrome") -> int:
+    """현재 페이지에서 상품 선택자(첫 번째로 매칭되는 것)에 잡히는 요소 수"""
+    return driver.execute_script(
+        "for (const s of arguments[0]) {"
+        " const n = document.querySelectorAll(s).length; if (n) return n; }"
+        " return 0;",
+        _PRODUCT_SELECTORS,
+    )
+
+
+def _find_driver_path() -> str:
+    """ChromeDriver 설치 후 실제 실행 파일 경로 탐색"""
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    # ChromeDriver 자동 다운로드 및 설치
+    driver_path = ChromeDriverManager().install()
+    logger.info(f"ChromeDriver 초기 경로: {driver_path}")
+
+    # OS별 ChromeDriver 실행 파일 이름
+    is_windows = platform.system() == 'Windows'
+    driver_name = 'chromedriver.exe' if is_windows else 'chromedriver'
+
+    # 반환된 경로의 디렉토리 찾기
+    if os.path.isfile(driver_path):
+        driver_dir = os.path.dirname(driver_path)
+    elif os.path.isdir(driver_path):
+        driver_dir = driver_path
+    else:
+        # 경로가 이상한 경우 상위 디렉토리 탐색
+        driver_dir = os.path.dirname(os.path.dirname(driver_path))
+
+    logger.info(f"ChromeDriver 탐색 디렉토리: {driver_dir}")
+
+    # 방법 1: 동일 디렉토리에서 실행 파일 찾기
+    exe_path = os.path.join(driver_dir, driver_name)
+    if os.path.exists(exe_path) and os.path.isfile(exe_path):
+        # Linux에서 실행 권한 부여
+        if not is_windows:
+            os.chmod(exe_path, 0o755)
+            logger.info(f"ChromeDriver 실행 권한 부여: {exe_path}")
+        logger.info(f"ChromeDriver 발견 (방법1): {exe_path}")
+        return exe_path
+
+    # 방법 2: 하위 디렉토리까지 재귀 탐색
+    for root, dirs, files in os.walk(driver_dir):
+        for file in files:
+            # 실행 파일 이름 정확히 매칭 (대소문자 구분)
+            if file == driver_name or (file == 'chromedriver' and not is_windows):
+                exe_path = os.path.join(root, file)
+                # 실제 실행 파일인지 확인 (크기가 있는지)
+                if os.path.getsize(exe_path) > 1000000:  # 1MB 이상
+                    # Linux에서 실행 권한 부여
+                    if not is_windows:
+                        os.chmod(exe_path, 0o755)
+                        logger.info(f"ChromeDriver 실행 권한 부여: {exe_path}")
+                    logger.info(f"ChromeDriver 발견 (방법2): {exe_path}")
+                    return exe_path
+
+    # 방법 3: 여전히 못 찾으면 원본 경로 시도
+    logger.warning(f"ChromeDriver 실행 파일을 찾지 못함, 원본 경로 시도")
+    # 원본 경로에도 실행 권한 부여 시도
+    if not is_windows and os.path.exists(driver_path):
+        try:
+            os.chmod(driver_path, 0o755)
+            logger.info(f"ChromeDriver 실행 권한 부여 (원본): {driver_path}")
+        except Exception as e:
+            logger.warning(f"실행 권한 부여 실패: {e}")
+    return driver_path
+
+
+def _get_driver_path() -> str:
+    """ChromeDriver 경로 조회 (최초 1회만 설치/탐색, 이후 캐시 사용)"""
+    global _driver_path
+    if _driver_path is None:
+        with _driver_path_lock:
+            if _driver_path is None:
+                _driver_path = _find_driver_path()
+    return _driver_path
+
+
+def _quit_drivers(drivers: List["webdriver.Chrome"]) -> None:
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"WebDriver 종료 실패: {e}")
+
+
+def _reap_idle_drivers() -> None:
+    """SELENIUM_IDLE_TIMEOUT 이상 사용되지 않은 WebDriver 종료"""
+    deadline = time.monotonic() - SELENIUM_IDLE_TIMEOUT
+    with _pool_lock:
+        expired = [driver for driver, released_at in _idle_drivers if released_at <= deadline]
+        _idle_drivers[:] = [(driver, released_at) for driver, released_at in _idle_drivers if released_at > deadline]
+
+    if expired:
+        _quit_drivers(expired)
+        logger.info(f"유휴 WebDriver 종료: {len(expired)}개")
+
+
+def _release_driver(driver: "webdriver.Chrome", healthy: bool) -> None:
+    """사용한 WebDriver를 빈 페이지로 되돌려 풀에 반납 (문제가 있으면 종료)"""
+    if healthy:
+        try:
+            driver.get("about:blank")
+            with _pool_lock:
+                _idle_drivers.append((driver, time.monotonic()))
+            # 이후 요청이 없어도 유휴 시간이 지나면 종료되도록 정리 예약
+            reaper = threading.Timer(SELENIUM_IDLE_TIMEOUT, _reap_idle_drivers)
+            reaper.daemon = True
+            reaper.start()
+            return
+        except Exception as e:
+            logger.warning(f"WebDriver 반납 실패, 종료 후 폐기: {e}")
+
+    _quit_drivers([driver])
+
+
+def close_driver_pool() -> None:
+    """풀에 남아 있는 WebDriver를 모두 종료 (앱 종료 시 호출)"""
+    with _pool_lock:
+        drivers = [driver for driver, _ in _idle_drivers]
+        _idle_drivers.clear()
+
+    _quit_drivers(drivers)
+
+    if drivers:
+        logger.info(f"WebDriver 풀 종료: {len(drivers)}개")
+
+
 class PriceCrawlerSelenium:
     """중고 시세 크롤링 클래스 (Selenium 버전)"""
 
@@ -32,6 +268,10 @@ class PriceCrawlerSelenium:
 
     def _create_driver(self):
         """Chrome WebDriver 생성 (Linux/Docker 호환)"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
         chrome_options = Options()
         chrome_options.add_argument('--headless')  # 백그라운드 실행
         chrome_options.add_argument('--no-sandbox')
@@ -40,143 +280,149 @@ class PriceCrawlerSelenium:
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
         chrome_options.add_argument('--log-level=3')  # 로그 최소화
+        # 가격 추출에 필요 없는 이미지/폰트 로드 차단 (페이지 로딩 시간/대역폭 절감)
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
 
         try:
-            # ChromeDriver 자동 다운로드 및 설치
-            driver_path = ChromeDriverManager().install()
-            logger.info(f"ChromeDriver 초기 경로: {driver_path}")
-
-            import os
-            import platform
-
-            # OS별 ChromeDriver 실행 파일 이름
-            is_windows = platform.system() == 'Windows'
-            driver_name = 'chromedriver.exe' if is_windows else 'chromedriver'
-
-            # 실제 chromedriver 실행 파일 찾기
-            service = None
-
-            # 반환된 경로의 디렉토리 찾기
-            if os.path.isfile(driver_path):
-                driver_dir = os.path.dirname(driver_path)
-            elif os.path.isdir(driver_path):
-                driver_dir = driver_path
-            else:
-                # 경로가 이상한 경우 상위 디렉토리 탐색
-                driver_dir = os.path.dirname(os.path.dirname(driver_path))
-
-            logger.info(f"ChromeDriver 탐색 디렉토리: {driver_dir}")
-
-            # 방법 1: 동일 디렉토리에서 실행 파일 찾기
-            exe_path = os.path.join(driver_dir, driver_name)
-            if os.path.exists(exe_path) and os.path.isfile(exe_path):
-                # Linux에서 실행 권한 부여
-                if not is_windows:
-                    os.chmod(exe_path, 0o755)
-                    logger.info(f"ChromeDriver 실행 권한 부여: {exe_path}")
-                service = Service(exe_path)
-                logger.info(f"ChromeDriver 발견 (방법1): {exe_path}")
-            else:
-                # 방법 2: 하위 디렉토리까지 재귀 탐색
-                for root, dirs, files in os.walk(driver_dir):
-                    for file in files:
-                        # 실행 파일 이름 정확히 매칭 (대소문자 구분)
-                        if file == driver_name or (file == 'chromedriver' and not is_windows):
-                            exe_path = os.path.join(root, file)
-                            # 실제 실행 파일인지 확인 (크기가 있는지)
-                            if os.path.getsize(exe_path) > 1000000:  # 1MB 이상
-                                # Linux에서 실행 권한 부여
-                                if not is_windows:
-                                    os.chmod(exe_path, 0o755)
-                                    logger.info(f"ChromeDriver 실행 권한 부여: {exe_path}")
-                                service = Service(exe_path)
-                                logger.info(f"ChromeDriver 발견 (방법2): {exe_path}")
-                                break
-                    if service:
-                        break
-
-                # 방법 3: 여전히 못 찾으면 원본 경로 시도
-                if not service:
-                    logger.warning(f"ChromeDriver 실행 파일을 찾지 못함, 원본 경로 시도")
-                    # 원본 경로에도 실행 권한 부여 시도
-                    if not is_windows and os.path.exists(driver_path):
-                        try:
-                            os.chmod(driver_path, 0o755)
-                            logger.info(f"ChromeDriver 실행 권한 부여 (원본): {driver_path}")
-                        except Exception as e:
-                            logger.warning(f"실행 권한 부여 실패: {e}")
-                    service = Service(driver_path)
-
+            service = Service(_get_driver_path())
             driver = webdriver.Chrome(service=service, options=chrome_options)
             driver.set_page_load_timeout(self.timeout)
+            # prefs로 막히지 않는 리소스(웹폰트, 동영상, 광고/분석 스크립트)는 URL 패턴으로 차단
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
             return driver
         except Exception as e:
             logger.error(f"ChromeDriver 생성 실패: {e}", exc_info=True)
             raise
 
-    def crawl_joongna(self, keyword: str, max_items: int = 20) -> List[int]:
-        """중고나라 크롤링"""
-        prices = []
+    @contextmanager
+    def _borrow_driver(self) -> Iterator["webdriver.Chrome"]:
+        """
+        드라이버 풀에서 WebDriver를 빌려오고, 사용 후 반납
+
+        - 풀이 비어 있으면 새로 생성 (동시에 최대 SELENIUM_POOL_SIZE 개)
+        - 사용 중 WebDriver 에러가 나면 반납하지 않고 종료 (다음 요청에서 새로 생성)
+        """
+        _pool_slots.acquire()
         driver = None
+        healthy = False
+        try:
+            _reap_idle_drivers()
+            with _pool_lock:
+                # 가장 최근에 반납된 드라이버부터 재사용 (오래된 드라이버는 유휴 시간 초과로 정리)
+                driver = _idle_drivers.pop()[0] if _idle_drivers else None
+            if driver is None:
+                driver = self._create_driver()
+            else:
+                driver.set_page_load_timeout(self.timeout)
+            yield driver
+            healthy = True
+        finally:
+            try:
+                if driver is not None:
+                    _release_driver(driver, healthy)
+            finally:
+                _pool_slots.release()
+
+    def crawl_joongna_http(self, keyword: str, max_items: int = 20) -> List[int]:
+        """
+        중고나라 크롤링 (브라우저 없이 HTML의 __NEXT_DATA__ 에서 가격 추출)
+
+        Returns:
+            가격 리스트 (페이지 구조가 달라 추출하지 못하면 빈 리스트 → Selenium 폴백)
+        """
+        search_url = f"https://web.joongna.com/search/{quote(keyword)}"
+        prices: List[int] = []
 
         try:
-            driver = self._create_driver()
-            search_url = f"https://web.joongna.com/search/{keyword}"
-            logger.info(f"중고나라 크롤링: URL 접속 중 - {search_url}")
-
-            driver.get(search_url)
-            time.sleep(3)  # JavaScript 렌더링 대기
-
-            # 페이지 스크롤 (lazy loading 트리거)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(2)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-
-            logger.info(f"중고나라 크롤링: 페이지 로딩 완료")
-
-            # 상품 카드 요소 찾기 (다양한 접근 방식)
-            product_selectors = [
-                'a[href*="/product/"]',  # 상품 링크
-                'article',  # 상품 카드
-                'div[class*="item"]',  # 아이템 컨테이너
-                'div[class*="product"]',  # 제품 컨테이너
-                'li[class*="item"]',  # 리스트 아이템
-            ]
-
-            product_elements = []
-            for selector in product_selectors:
-                product_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                if product_elements:
-                    logger.info(f"중고나라: 선택자 '{selector}'로 {len(product_elements)}개 상품 발견")
-                    break
-
-            if not product_elements:
-                logger.warning(f"중고나라: 상품 요소를 찾을 수 없음")
-                # 디버깅 정보 출력
-                page_text = driver.find_element(By.TAG_NAME, 'body').text[:1000]
-                logger.warning(f"중고나라: 페이지 텍스트 샘플: {page_text[:300]}")
-                screenshot_path = "debug_joongna.png"
-                driver.save_screenshot(screenshot_path)
-                logger.info(f"중고나라: 디버깅 스크린샷 저장 - {screenshot_path}")
-
-                # HTML 구조 일부 저장
-                html_sample = driver.page_source[:3000]
-                with open("debug_joongna.html", "w", encoding="utf-8") as f:
-                    f.write(html_sample)
-                logger.info(f"중고나라: HTML 샘플 저장 - debug_joongna.html")
+            resp = _http_client.get(search_url, timeout=self.timeout)
+            resp.raise_for_status()
+
+            match = _NEXT_DATA_RE.search(resp.text)
+            if not match:
+                logger.info(f"중고나라(HTTP): __NEXT_DATA__ 없음 - {keyword}")
                 return prices
 
-            logger.info(f"중고나라: 총 {len(product_elements)}개 상품 요소 발견")
+            _find_next_data_prices(json.loads(match.group(1)), prices, max_items)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"중고나라(HTTP) 크롤링 실패: {keyword} - {e}")
+            return []
 
-            # 각 상품 카드에서 가격 추출
-            for idx, product in enumerate(product_elements[:max_items]):
-                try:
-                    # 상품 카드 내에서 가격 찾기
-                    price_text = None
+        logger.info(f"중고나라(HTTP) 크롤링 완료: {keyword} -> {len(prices)}개")
+        return prices
+
+    def crawl_joongna(self, keyword: str, max_items: int = 20) -> List[int]:
+        """중고나라 크롤링 (Selenium)"""
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        prices = []
+
+        try:
+            # 풀에서 예열된 드라이버를 빌려 사용 (에러 발생 시 해당 드라이버는 폐기)
+            with self._borrow_driver() as driver:
+                search_url = f"https://web.joongna.com/search/{keyword}"
+                logger.info(f"중고나라 크롤링: URL 접속 중 - {search_url}")
+
+                driver.get(search_url)
 
+                # JavaScript 렌더링 대기 (고정 sleep 대신 상품 요소가 나타나는 즉시 진행)
+                try:
+                    WebDriverWait(driver, self.timeout).until(
+                        lambda d: _count_products(d) > 0
+                    )
+                except TimeoutException:
+                    logger.warning(f"중고나라: {self.timeout}초 내 상품 요소가 나타나지 않음")
+
+                # 페이지 스크롤 (lazy loading 트리거) - 상품 수가 더 늘지 않거나 충분하면 중단 (최대 2회)
+                product_count = _count_products(driver)
+                for _ in range(2):
+                    if product_count == 0 or product_count >= max_items:
+                        break
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    try:
+                        WebDriverWait(driver, _LAZY_LOAD_WAIT, poll_frequency=0.2).until(
+                            lambda d: _count_products(d) > product_count
+                        )
+                    except TimeoutException:
+                        break
+                    product_count = _count_products(driver)
+
+                logger.info(f"중고나라 크롤링: 페이지 로딩 완료")
+
+                # 상품 카드 요소 찾기 (다양한 접근 방식)
+                # - 카드 텍스트를 한 번의 execute_script 호출로 수집
+                # - 카드/하위 요소마다 .text 를 호출하면 요소 수만큼 WebDriver 왕복이 발생
+                scraped = driver.execute_script(_SCRAPE_PRODUCTS_JS, _PRODUCT_SELECTORS, max_items)
+
+                if not scraped:
+                    logger.warning(f"중고나라: 상품 요소를 찾을 수 없음")
+                    # 디버깅 정보 출력
+                    page_text = driver.find_element(By.TAG_NAME, 'body').text[:1000]
+                    logger.warning(f"중고나라: 페이지 텍스트 샘플: {page_text[:300]}")
+                    screenshot_path = "debug_joongna.png"
+                    driver.save_screenshot(screenshot_path)
+                    logger.info(f"중고나라: 디버깅 스크린샷 저장 - {screenshot_path}")
+
+                    # HTML 구조 일부 저장
+                    html_sample = driver.page_source[:3000]
+                    with open("debug_joongna.html", "w", encoding="utf-8") as f:
+                        f.write(html_sample)
+                    logger.info(f"중고나라: HTML 샘플 저장 - debug_joongna.html")
+                    return prices
+
+                logger.info(f"중고나라: 선택자 '{scraped['selector']}'로 {scraped['total']}개 상품 발견")
+
+            # 각 상품 카드에서 가격 추출 (드라이버 호출 없이 파이썬에서 처리하므로 드라이버는 먼저 반납)
+            for idx, card in enumerate(scraped["cards"]):
+                try:
                     # 방법 1: 전체 텍스트에서 가격 패턴 찾기
-                    product_text = product.text
+                    product_text = card.get("text")
                     if product_text:
                         price = self._extract_price(product_text)
                         if price:
@@ -185,10 +431,8 @@ class PriceCrawlerSelenium:
                             continue
 
                     # 방법 2: 하위 요소에서 가격 찾기
-                    price_candidates = product.find_elements(By.CSS_SELECTOR,
-                        'span, div, p, strong, b')
-                    for candidate in price_candidates:
-                        text = candidate.text.strip()
+                    for text in card.get("parts") or []:
+                        text = text.strip()
                         if text and ('원' in text or '만원' in text or text.replace(',','').isdigit()):
                             price = self._extract_price(text)
                             if price:
@@ -206,9 +450,6 @@ class PriceCrawlerSelenium:
             logger.error(f"중고나라 WebDriver 에러: {e}")
         except Exception as e:
             logger.error(f"중고나라 크롤링 에러: {type(e).__name__}: {str(e)}", exc_info=True)
-        finally:
-            if driver:
-                driver.quit()
 
         logger.info(f"중고나라 크롤링 완료: {keyword} -> {len(prices)}개")
         return prices
@@ -217,7 +458,10 @@ class PriceCrawlerSelenium:
         """중고나라 크롤링"""
         logger.info(f"크롤링 시작: {keyword}")
 
-        joongna_prices = self.crawl_joongna(keyword, max_items_per_platform)
+        # HTML 파싱으로 먼저 시도하고, 가격을 못 얻은 경우에만 Chrome 사용
+        joongna_prices = self.crawl_joongna_http(keyword, max_items_per_platform)
+        if not joongna_prices:
+            joongna_prices = self.crawl_joongna(keyword, max_items_per_platform)
 
         total_count = len(joongna_prices)
         logger.info(f"크롤링 완료: 총 {total_count}개 수집")
@@ -229,12 +473,12 @@ class PriceCrawlerSelenium:
     def _extract_price(self, text: str) -> Optional[int]:
         """텍스트에서 가격 추출"""
         # 공백, 쉼표 제거
-        text = text.replace(',', '').replace(' ', '').replace('\n', '')
+        text = text.translate(_PRICE_STRIP_TABLE)
 
         # "만원" 표기 처리 (예: "49만원", "49.9만원")
         if '만원' in text:
             # 소수점 포함 (예: 49.9만원 -> 499000)
-            match = re.search(r'(\d+\.?\d*)만원', text)
+            match = _PAT_MAN_WON.search(text)
             if match:
                 value = float(match.group(1))
                 price = int(value * 10000)
@@ -243,7 +487,7 @@ class PriceCrawlerSelenium:
 
         # "만" 표기 처리 (예: "49만", "49.9만")
         if '만' in text and '만원' not in text:
-            match = re.search(r'(\d+\.?\d*)만', text)
+            match = _PAT_MAN.search(text)
             if match:
                 value = float(match.group(1))
                 price = int(value * 10000)
@@ -252,14 +496,14 @@ class PriceCrawlerSelenium:
 
         # "원" 표기 처리 (예: "490000원")
         if '원' in text:
-            match = re.search(r'(\d+)원', text)
+            match = _PAT_WON.search(text)
             if match:
                 price = int(match.group(1))
                 if 1000 <= price <= 100000000:
                     return price
 
         # 숫자만 있는 경우 (예: "490000")
-        match = re.search(r'(\d{4,})', text)
+        match = _PAT_DIGITS.search(text)
         if match:
             price = int(match.group(1))
             if 1000 <= price <= 100000000:
@@ -278,20 +522,51 @@ class PriceCrawlerSelenium:
 
 
 def crawl_with_fallback_selenium(keyword: str, min_samples: int = 3) -> dict:
-    """키워드 축소 재시도 포함 크롤링 (중고나라 전용)"""
-    crawler = PriceCrawlerSelenium()
-    current_keyword = keyword
+    """
+    키워드 축소 재시도 포함 크롤링 (중고나라 전용)
 
-    while current_keyword:
-        results = crawler.crawl_all(current_keyword)
-        total_count = len(results["joongna"])
-
-        if total_count >= min_samples:
-            results["final_keyword"] = current_keyword
-            return results
+    - 원래 키워드와 축소 키워드 앞쪽 몇 개(FALLBACK_PARALLELISM)의 HTTP 크롤링을 동시에 실행
+    - HTTP 로 가격을 못 얻은 키워드만 Chrome 으로 크롤링 (요청 스레드에서 한 번에 하나씩, 드라이버 풀을 추측 실행으로 점유하지 않음)
+    - 결과는 긴(구체적인) 키워드부터 확인해 샘플 수를 만족하는 첫 키워드를 사용 (순차 실행과 같은 선택)
+    """
+    crawler = PriceCrawlerSelenium()
 
-        logger.warning(f"샘플 부족 ({total_count}개 < {min_samples}개), 키워드 축소 시도")
-        current_keyword = crawler.reduce_keyword(current_keyword)
+    # 시도할 키워드 목록: 원래 키워드 → 마지막 단어를 하나씩 제거
+    candidates = [keyword]
+    while True:
+        reduced = crawler.reduce_keyword(candidates[-1])
+        if not reduced:
+            break
+        candidates.append(reduced)
+
+    futures = []
+    results = None
+    try:
+        for idx, current_keyword in enumerate(candidates):
+            # 앞쪽 후보의 HTTP 크롤링은 한꺼번에 제출 (사이트 차단 방지를 위해 제출 간격을 조금 둠)
+            while len(futures) < len(candidates) and len(futures) < idx + FALLBACK_PARALLELISM:
+                if futures:
+                    time.sleep(_FALLBACK_STAGGER_SECONDS)
+                futures.append(_fallback_executor.submit(crawler.crawl_joongna_http, candidates[len(futures)]))
+
+            logger.info(f"크롤링 시작: {current_keyword}")
+            prices = futures[idx].result()
+            if not prices:
+                # HTML 파싱으로 가격을 못 얻은 경우에만 Chrome 사용 (crawl_all 과 같은 순서)
+                prices = crawler.crawl_joongna(current_keyword)
+            results = {"joongna": prices}
+            total_count = len(prices)
+            logger.info(f"크롤링 완료: 총 {total_count}개 수집")
+
+            if total_count >= min_samples:
+                results["final_keyword"] = current_keyword
+                return results
+
+            logger.warning(f"샘플 부족 ({total_count}개 < {min_samples}개): {current_keyword}")
+    finally:
+        # 이미 답을 찾았으면 아직 시작하지 않은 축소 키워드 HTTP 크롤링은 취소
+        for future in futures:
+            future.cancel()
 
     logger.warning(f"키워드 축소 한계 도달, 수집된 데이터로 진행")
     results["final_keyword"] = keyword
@@ -1,12 +1,81 @@
+import logging
+import os
+import tempfile
+import threading
 import time
-from collections import Counter, defaultdict
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sqlalchemy.orm import Session
+import scipy.sparse as sp
+from sqlalchemy import BigInteger, all_, func, literal, select, union_all
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, joinedload
 from models.db_models import UserDB, ItemDB, ItemTransactionDB, UserLikedDB
 from models.api_models import ItemRecommendation
 from models.enums import ItemStatusEnum
+from utils.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _unique_pairs(rows) -> np.ndarray:
+    """(user_id, item_id) 행 목록을 중복 제거된 (N, 2) int64 배열로 변환 (사용자, 상품 순 정렬)"""
+    pairs = np.array(rows, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) == 0:
+        return pairs
+    return np.unique(pairs, axis=0)
+
+
+# 인기 상품 조회 시 이 개수를 넘는 제외 상품은 NOT IN 목록 대신 배열 파라미터로 전달
+_NOT_IN_ARRAY_THRESHOLD = 100
+
+# 상호작용이 없는 사용자의 상품 ID 배열
+_EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+def _group_pairs(pairs: np.ndarray) -> Dict[int, np.ndarray]:
+    """사용자 순으로 정렬된 (user_id, item_id) 쌍을 사용자별 상품 ID 배열(정렬, 중복 없음)로 묶음"""
+    if len(pairs) == 0:
+        return {}
+    users, starts = np.unique(pairs[:, 0], return_index=True)
+    groups = np.split(pairs[:, 1], starts[1:])
+    return dict(zip(users.tolist(), groups))
+
+
+def _flatten_groups(groups: Dict[int, np.ndarray]) -> np.ndarray:
+    """_group_pairs 의 역변환: 사용자별 상품 ID 배열을 (user_id, item_id) 쌍 배열로 펼침"""
+    if not groups:
+        return np.empty((0, 2), dtype=np.int64)
+    users = np.repeat(
+        np.fromiter(groups.keys(), dtype=np.int64, count=len(groups)),
+        [len(items) for items in groups.values()],
+    )
+    return np.column_stack([users, np.concatenate(list(groups.values()))])
+
+
+def _lookup_sorted(sorted_keys: np.ndarray, values: np.ndarray):
+    """정렬된 키 배열에서 values 의 위치와 존재 여부 반환 (이진 탐색)"""
+    pos = np.searchsorted(sorted_keys, values)
+    if len(sorted_keys) == 0:
+        return pos, np.zeros(len(values), dtype=bool)
+    found = sorted_keys[np.minimum(pos, len(sorted_keys) - 1)] == values
+    return pos, found
+
+
+class RecommendationList(list):
+    """추천 결과 리스트 + 오류로 인한 폴백 여부 (degraded=True 인 결과는 캐시하지 않음)"""
+
+    def __init__(self, items=(), degraded: bool = False):
+        super().__init__(items)
+        self.degraded = degraded
+
+
+class UserNotFoundError(Exception):
+    """추천 대상 사용자가 존재하지 않을 때 발생"""
+
+    def __init__(self, user_id: int):
+        super().__init__(f"User with id {user_id} not found")
+        self.user_id = user_id
+
 
 class AuctionRecommender:
     """
@@ -20,134 +89,200 @@ class AuctionRecommender:
     """
     
     def __init__(self, db: Session):
-        print("AuctionRecommender 초기화 시작...")
+        """
+        Args:
+            db: 초기 데이터 로드용 세션 (인스턴스에 보관하지 않음, 요청 시에는 요청 세션을 전달)
+        """
+        logger.info("AuctionRecommender 초기화 시작...")
         start_time = time.time()
-        
-        self.db = db
+        self.built_at = start_time
         
         # 데이터 로드
-        print("데이터 로드 중...")
-        self._load_data()
+        logger.info("데이터 로드 중...")
+        self._load_data(db)
         
         # 피처 매트릭스 생성
-        print("피처 매트릭스 생성 중...")
+        logger.info("피처 매트릭스 생성 중...")
         self._create_feature_matrix()
         
-        # 유사도 행렬 계산
-        print("유사도 행렬 계산 중...")
-        self._calculate_similarity()
-        
         elapsed = time.time() - start_time
-        print(f"AuctionRecommender 초기화 완료. 소요 시간: {elapsed:.2f}초")
+        logger.info("AuctionRecommender 초기화 완료. 소요 시간: %.2f초", elapsed)
     
-    def _load_data(self):
-        """DB에서 필요한 데이터 로드"""
+    def _load_data(self, db: Session):
+        """DB에서 필요한 데이터 로드 (Core select 로 필요한 컬럼만 받아 NumPy 배열로 보관)"""
         load_start = time.time()
         
-        # 모든 사용자 조회
-        users = self.db.query(UserDB).all()
-        
-        # 모든 상품을 딕셔너리로 저장 (빠른 조회를 위해)
-        items = {item.item_id: item for item in self.db.query(ItemDB).all()}
+        # 모든 사용자 ID (피처 매트릭스 행 순서)
+        self._user_ids = np.fromiter(db.execute(select(UserDB.id)).scalars(), dtype=np.int64)
         
-        # 모든 입찰 내역 조회
-        transactions = self.db.query(ItemTransactionDB).all()
+        # 프로필(카테고리 빈도): DB에서 (user_id, category)별로 집계해 집계 결과만 전송
+        # - 입찰과 찜은 각각 집계 (같은 상품에 여러 번 입찰해도 한 번으로 집계)
+        bid_counts = (
+            select(
+                ItemTransactionDB.buyer_id,
+                ItemDB.category,
+                func.count(ItemTransactionDB.item_id.distinct()),
+            )
+            .join(ItemDB, ItemDB.item_id == ItemTransactionDB.item_id)
+            .where(ItemDB.category.isnot(None))
+            .group_by(ItemTransactionDB.buyer_id, ItemDB.category)
+        )
+        liked_counts = (
+            select(
+                UserLikedDB.user_id,
+                ItemDB.category,
+                func.count(UserLikedDB.item_id.distinct()),
+            )
+            .join(ItemDB, ItemDB.item_id == UserLikedDB.item_id)
+            .where(UserLikedDB.liked == True, ItemDB.category.isnot(None))
+            .group_by(UserLikedDB.user_id, ItemDB.category)
+        )
+        profile_rows = db.execute(union_all(bid_counts, liked_counts)).all()
+        self._profile_user_ids = np.fromiter(
+            (user_id for user_id, _, _ in profile_rows), dtype=np.int64, count=len(profile_rows)
+        )
+        self._profile_categories = np.array([category.value for _, category, _ in profile_rows], dtype=str)
+        self._profile_counts = np.fromiter(
+            (count for _, _, count in profile_rows), dtype=np.float32, count=len(profile_rows)
+        )
+        
+        # 입찰/찜 내역: (user_id, item_id) 쌍 (같은 상품에 여러 번 입찰해도 한 번으로 집계)
+        bid_pairs = _unique_pairs(
+            db.execute(select(ItemTransactionDB.buyer_id, ItemTransactionDB.item_id)).all()
+        )
+        liked_pairs = _unique_pairs(
+            db.execute(
+                select(UserLikedDB.user_id, UserLikedDB.item_id).where(UserLikedDB.liked == True)
+            ).all()
+        )
         
-        # 모든 위시리스트 조회
-        liked_items = self.db.query(UserLikedDB).filter(UserLikedDB.liked == True).all()
+        # 사용자별 입찰/찜한 상품 ID 매핑
+        self._set_interactions(bid_pairs, liked_pairs)
         
-        # 사용자별 입찰한 상품 ID 매핑
-        self.user_bid_items: Dict[int, Set[int]] = defaultdict(set)
-        for trans in transactions:
-            self.user_bid_items[trans.buyer_id].add(trans.item_id)
+        load_time = time.time() - load_start
+        logger.info(
+            "데이터 로드 완료. Users: %s, Profile rows: %s, Transactions: %s, Liked: %s. 소요 시간: %.2f초",
+            len(self._user_ids), len(profile_rows), len(bid_pairs), len(liked_pairs), load_time,
+        )
+    
+    def _create_feature_matrix(self):
+        """DB에서 집계한 사용자별 카테고리 빈도를 CSR 희소 행렬로 변환"""
+        user_ids = self._user_ids
         
-        # 사용자별 찜한 상품 ID 매핑
-        self.user_liked_items: Dict[int, Set[int]] = defaultdict(set)
-        for liked in liked_items:
-            self.user_liked_items[liked.user_id].add(liked.item_id)
+        # 집계 행 → 행: 사용자 인덱스 (사용자 테이블에 없는 내역은 제외)
+        user_order = np.argsort(user_ids, kind="stable")
+        user_pos, user_found = _lookup_sorted(user_ids[user_order], self._profile_user_ids)
+        rows = user_order[user_pos[user_found]]
         
-        # 사용자 프로필 생성: 카테고리 빈도수 Counter
-        self.user_profiles: Dict[int, Counter] = {}
+        # 실제로 등장한 카테고리만 열로 사용 (카테고리 이름 오름차순)
+        category_names, cols = np.unique(self._profile_categories[user_found], return_inverse=True)
+        n_users, n_cols = len(user_ids), len(category_names)
         
-        for user in users:
-            profile = Counter()
-            
-            # 입찰한 상품의 카테고리 수집
-            bid_item_ids = self.user_bid_items.get(user.id, set())
-            for item_id in bid_item_ids:
-                item = items.get(item_id)
-                if item and item.category:
-                    profile[item.category.value] += 1
-            
-            # 찜한 상품의 카테고리 수집
-            liked_item_ids = self.user_liked_items.get(user.id, set())
-            for item_id in liked_item_ids:
-                item = items.get(item_id)
-                if item and item.category:
-                    profile[item.category.value] += 1
-            
-            self.user_profiles[user.id] = profile
+        # 입찰/찜 집계가 같은 (행, 열)에 겹치면 CSR 변환 시 합산됨
+        feature_matrix = sp.coo_matrix(
+            (self._profile_counts[user_found], (rows, cols)),
+            shape=(n_users, n_cols),
+        ).tocsr()
+        self._set_feature_matrix(user_ids, feature_matrix, category_names.tolist())
         
-        self.all_items = items
+        # 집계용 중간 배열은 더 이상 필요 없음
+        del self._profile_user_ids, self._profile_categories, self._profile_counts, self._user_ids
         
-        load_time = time.time() - load_start
-        print(f"데이터 로드 완료. Users: {len(users)}, Items: {len(items)}, "
-              f"Transactions: {len(transactions)}, Liked: {len(liked_items)}. "
-              f"소요 시간: {load_time:.2f}초")
+        logger.info("피처 매트릭스 생성 완료. Shape: %s", self.feature_matrix.shape)
     
-    def _create_feature_matrix(self):
-        """사용자별 카테고리 빈도 벡터를 행렬로 변환"""
-        # 모든 카테고리를 수집하여 열(column) 정의
-        all_categories = set()
-        for profile in self.user_profiles.values():
-            all_categories.update(profile.keys())
-        
-        # 카테고리를 정렬하여 일관된 순서 보장
-        self.feature_columns = {category: idx for idx, category in enumerate(sorted(all_categories))}
-        
-        # 사용자별 벡터 생성
-        feature_matrix = []
-        user_ids = []
-        
-        for user_id, profile in self.user_profiles.items():
-            # 벡터 초기화 (모든 카테고리에 대해 0)
-            vec = [0] * len(self.feature_columns)
-            
-            # 해당 사용자의 카테고리 빈도 채우기
-            for category, count in profile.items():
-                idx = self.feature_columns.get(category)
-                if idx is not None:
-                    vec[idx] = count
-            
-            feature_matrix.append(vec)
-            user_ids.append(user_id)
-        
-        # NumPy 배열로 변환
-        self.feature_matrix = np.array(feature_matrix)
-        self.user_id_list = user_ids
+    def _set_interactions(self, bid_pairs: np.ndarray, liked_pairs: np.ndarray):
+        """사용자별 입찰/찜 상품 ID 매핑 설정 (빌드/스냅샷 로드 공통)"""
+        self.user_bid_items: Dict[int, np.ndarray] = _group_pairs(bid_pairs)
+        self.user_liked_items: Dict[int, np.ndarray] = _group_pairs(liked_pairs)
+        # 입찰 ∪ 찜 (추천 제외 대상) 을 미리 합쳐 둠 → 요청마다 합집합을 만들지 않음
+        self.user_interacted: Dict[int, np.ndarray] = _group_pairs(
+            np.unique(np.concatenate([bid_pairs, liked_pairs]), axis=0)
+        )
+    
+    def _set_feature_matrix(self, user_ids: np.ndarray, feature_matrix: sp.csr_matrix, feature_names: List[str]):
+        """피처 매트릭스와 이로부터 파생되는 조회용 구조 설정 (빌드/스냅샷 로드 공통)"""
+        self.feature_matrix = feature_matrix
+        self.feature_columns = {name: idx for idx, name in enumerate(feature_names)}
+        # 행 단위 L2 정규화 → 두 행의 내적이 곧 코사인 유사도 (피처가 없는 행은 0 벡터 유지)
+        # 열 수가 카테고리 수라 작으므로 dense float32 로 두고 BLAS(SGEMV)로 한 행씩 계산
+        # U×U 유사도 행렬은 만들지 않고, 요청된 사용자 행만 get_similar_users 에서 계산
+        dense = self.feature_matrix.toarray()
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.feature_matrix_norm = np.ascontiguousarray(dense / norms, dtype=np.float32)
+        # 행렬 인덱스 → 사용자 ID (인덱스 배열로 바로 사용자 ID를 뽑음)
+        self.user_id_arr = np.asarray(user_ids, dtype=np.int64)
+        # 사용자 ID → 행렬 인덱스 매핑 (행 순서가 정해지는 이곳에서 한 번만 생성)
+        self.user_idx_map = dict(zip(self.user_id_arr.tolist(), range(len(self.user_id_arr))))
+        # 사용자별 유사 사용자 목록 (요청 시 채워지는 이웃 인덱스, 피처 매트릭스와 수명을 같이함)
+        self._neighbor_index: Dict[int, List[int]] = {}
+    
+    def save(self, path: str):
+        """
+        추천기 상태를 .npz 스냅샷으로 저장 (재시작 시 DB 조회 없이 복원)
         
-        print(f"피처 매트릭스 생성 완료. Shape: {self.feature_matrix.shape}")
+        Args:
+            path: 스냅샷 파일 경로
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 여러 워커가 동시에 저장해도 읽는 쪽이 깨진 파일을 보지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                built_at=np.float64(self.built_at),
+                user_ids=self.user_id_arr,
+                feature_data=self.feature_matrix.data,
+                feature_indices=self.feature_matrix.indices,
+                feature_indptr=self.feature_matrix.indptr,
+                feature_names=np.array(list(self.feature_columns), dtype=str),
+                bid_pairs=_flatten_groups(self.user_bid_items),
+                liked_pairs=_flatten_groups(self.user_liked_items),
+            )
+        os.replace(tmp_path, path)
+        logger.info("추천기 스냅샷 저장 완료: %s", path)
     
-    def _calculate_similarity(self):
-        """코사인 유사도 행렬 계산"""
-        # 피처가 없는 경우 (데이터가 없거나 카테고리가 없는 경우) 처리
-        if self.feature_matrix.shape[1] == 0:
-            print("경고: 피처가 없어 유사도 행렬을 생성할 수 없습니다. 빈 행렬로 초기화합니다.")
-            # 빈 유사도 행렬 생성 (사용자 수 x 사용자 수)
-            n_users = len(self.user_id_list)
-            self.similarity_matrix = np.zeros((n_users, n_users))
-            # 사용자 ID → 행렬 인덱스 매핑
-            self.user_idx_map = {uid: idx for idx, uid in enumerate(self.user_id_list)}
-            print(f"빈 유사도 행렬 생성 완료. Shape: {self.similarity_matrix.shape}")
-            return
+    @classmethod
+    def load(cls, path: str, max_age: float) -> Optional["AuctionRecommender"]:
+        """
+        save() 로 저장한 스냅샷에서 추천기 복원
         
-        # sklearn의 cosine_similarity 사용
-        self.similarity_matrix = cosine_similarity(self.feature_matrix)
+        Args:
+            path: 스냅샷 파일 경로
+            max_age: 허용하는 스냅샷 최대 나이(초)
         
-        # 사용자 ID → 행렬 인덱스 매핑
-        self.user_idx_map = {uid: idx for idx, uid in enumerate(self.user_id_list)}
+        Returns:
+            복원된 추천기 (파일이 없거나, 오래됐거나, 읽을 수 없으면 None)
+        """
+        if not os.path.exists(path):
+            return None
         
-        print(f"유사도 행렬 계산 완료. Shape: {self.similarity_matrix.shape}")
+        try:
+            with np.load(path, allow_pickle=False) as snapshot:
+                built_at = float(snapshot["built_at"])
+                if time.time() - built_at > max_age:
+                    logger.info("추천기 스냅샷이 오래되어 사용하지 않습니다: %s", path)
+                    return None
+                
+                user_ids = snapshot["user_ids"]
+                feature_names = snapshot["feature_names"].tolist()
+                feature_matrix = sp.csr_matrix(
+                    (snapshot["feature_data"], snapshot["feature_indices"], snapshot["feature_indptr"]),
+                    shape=(len(user_ids), len(feature_names)),
+                )
+                bid_pairs = snapshot["bid_pairs"]
+                liked_pairs = snapshot["liked_pairs"]
+        except Exception:
+            logger.exception("추천기 스냅샷 로드 실패: %s", path)
+            return None
+        
+        recommender = cls.__new__(cls)
+        recommender.built_at = built_at
+        recommender._set_interactions(bid_pairs, liked_pairs)
+        recommender._set_feature_matrix(user_ids, feature_matrix, feature_names)
+        
+        logger.info("추천기 스냅샷 로드 완료: %s. Shape: %s", path, feature_matrix.shape)
+        return recommender
     
     def get_similar_users(self, target_user_id: int, n_users: int = 5) -> List[int]:
         """
@@ -163,22 +298,31 @@ class AuctionRecommender:
         if target_user_id not in self.user_idx_map:
             return []
         
+        # 이미 탐색한 사용자는 유사도 행 스캔/정렬 없이 이웃 인덱스에서 바로 반환
+        cached = self._neighbor_index.get(target_user_id)
+        if cached is not None and len(cached) >= n_users:
+            return cached[:n_users]
+        
         # 대상 사용자의 행렬 인덱스
         idx = self.user_idx_map[target_user_id]
         
-        # 유사도 점수 가져오기
-        sim_scores = self.similarity_matrix[idx]
+        # 대상 사용자 행과 전체 사용자의 코사인 유사도 (정규화된 행끼리의 내적, float32 BLAS)
+        sim_scores = self.feature_matrix_norm @ self.feature_matrix_norm[idx]
         
-        # 자기 자신 제외하기 위한 마스크
-        user_id_list_np = np.array(self.user_id_list)
-        is_not_target = user_id_list_np != target_user_id
+        # 자기 자신은 -inf 로 만들어 제외
+        sim_scores[idx] = -np.inf
         
-        # 유사도 점수 정렬 (내림차순)
-        # 자기 자신의 유사도는 0으로 만들어 제외
-        sorted_indices = np.argsort(sim_scores * is_not_target)[::-1]
+        k = min(n_users, len(sim_scores) - 1)
+        if k <= 0:
+            return []
+        
+        # 상위 k개만 선택(O(U)) 후 그 k개만 내림차순 정렬
+        top = np.argpartition(-sim_scores, k - 1)[:k]
+        top = top[np.argsort(-sim_scores[top], kind="stable")]
         
         # 상위 N명 반환
-        similar_user_ids = [user_id_list_np[i] for i in sorted_indices[:n_users]]
+        similar_user_ids = self.user_id_arr[top].tolist()
+        self._neighbor_index[target_user_id] = similar_user_ids
         
         return similar_user_ids
     
@@ -186,25 +330,37 @@ class AuctionRecommender:
         self, 
         target_user_id: int, 
         n_recommendations: int = 10,
-        db_session: Session = None  # ⭐ 새 파라미터 추가
-    ) -> List[ItemRecommendation]:
+        *,
+        db_session: Session
+    ) -> RecommendationList:
         """
         대상 사용자에게 경매 상품 추천
         
         Args:
             target_user_id: 추천 대상 사용자 ID
             n_recommendations: 추천할 상품 개수 (기본값: 10)
-            db_session: DB 세션 (매 요청마다 새로 전달)
+            db_session: DB 세션 (매 요청마다 새로 전달, 인스턴스는 요청 간 공유되므로 필수)
         
         Returns:
-            추천 상품 리스트 (ItemRecommendation 객체)
+            추천 상품 리스트 (ItemRecommendation 객체), DB 오류로 폴백한 경우 degraded=True
+        
+        Raises:
+            UserNotFoundError: 대상 사용자가 존재하지 않는 경우
         """
         from datetime import datetime
         
-        # ⭐ 세션 선택: 전달받은 세션이 있으면 사용, 없으면 초기화 시 세션 사용
-        db = db_session if db_session is not None else self.db
+        db = db_session
         
-        print(f"사용자 {target_user_id}에 대한 추천 생성 시작...")
+        # 초기화 시 로드된 사용자는 DB 조회 없이 통과, 이후 가입한 사용자만 DB에서 확인
+        if target_user_id not in self.user_idx_map:
+            user_exists = db.query(UserDB.id).filter(UserDB.id == target_user_id).first()
+            if not user_exists:
+                raise UserNotFoundError(target_user_id)
+        
+        logger.debug("사용자 %s에 대한 추천 생성 시작", target_user_id)
+        
+        # 대상 사용자가 이미 접한 상품 (후보 제외/인기 상품 조회에 공통으로 사용)
+        user_interacted = self.user_interacted.get(target_user_id, _EMPTY_IDS)
         
         try:
             # 1. 유사 사용자 찾기
@@ -212,50 +368,55 @@ class AuctionRecommender:
             
             # Cold Start 대응: 유사 사용자가 없으면 인기 상품 추천
             if not similar_users:
-                print(f"사용자 {target_user_id}의 유사 사용자를 찾을 수 없습니다. 인기 상품으로 대체합니다.")
+                logger.info("사용자 %s의 유사 사용자를 찾을 수 없습니다. 인기 상품으로 대체합니다.", target_user_id)
                 # ⭐ 롤백 후 인기 상품 조회
                 db.rollback()
-                return self._get_popular_items(target_user_id, n_recommendations, db)
+                return self._get_popular_items(target_user_id, n_recommendations, db, user_interacted)
             
-            print(f"유사 사용자 {len(similar_users)}명 발견: {similar_users}")
+            logger.debug("유사 사용자 %s명 발견: %s", len(similar_users), similar_users)
             
-            # 2. 유사 사용자들이 입찰/찜한 상품 수집
-            candidate_items = []
-            for uid in similar_users:
-                candidate_items.extend(self.user_bid_items.get(uid, []))
-                candidate_items.extend(self.user_liked_items.get(uid, []))
+            # 2. 유사 사용자들이 입찰/찜한 상품 수집 (사용자별 배열을 한 번에 이어붙임)
+            candidate_items = np.concatenate(
+                [self.user_bid_items.get(uid, _EMPTY_IDS) for uid in similar_users]
+                + [self.user_liked_items.get(uid, _EMPTY_IDS) for uid in similar_users]
+            )
             
             # 3. 대상 사용자가 이미 접한 상품 제외
-            user_interacted = self.user_bid_items.get(target_user_id, set()) | \
-                             self.user_liked_items.get(target_user_id, set())
+            candidate_items = candidate_items[np.isin(candidate_items, user_interacted, invert=True)]
             
             # 4. 빈도수 계산
-            candidate_counts = Counter(candidate_items)
+            item_ids, counts = np.unique(candidate_items, return_counts=True)
             
-            for item_id in user_interacted:
-                candidate_counts.pop(item_id, None)
-            
-            # 5. 상위 N개 추출
-            recommended_item_ids = [item_id for item_id, _ in candidate_counts.most_common(n_recommendations * 2)]
+            # 5. 상위 N개 추출 (상위 k개만 선택 후 빈도 내림차순 정렬)
+            k = min(n_recommendations * 2, len(item_ids))
+            top = np.argpartition(-counts, k - 1)[:k] if k < len(item_ids) else np.arange(k)
+            top = top[np.argsort(-counts[top], kind="stable")]
+            candidate_counts = dict(zip(item_ids[top].tolist(), counts[top].tolist()))
+            recommended_item_ids = list(candidate_counts)
             
             # Cold Start 대응: 후보 아이템이 없으면 인기 상품 추천
             if not recommended_item_ids:
-                print("협업 필터링 후보가 없습니다. 인기 상품으로 대체합니다.")
+                logger.info("사용자 %s: 협업 필터링 후보가 없습니다. 인기 상품으로 대체합니다.", target_user_id)
                 # ⭐ 롤백 후 인기 상품 조회
                 db.rollback()
-                return self._get_popular_items(target_user_id, n_recommendations, db)
+                return self._get_popular_items(target_user_id, n_recommendations, db, user_interacted)
             
             # ⭐ 6. DB에서 상품 상세 정보 조회 (try-except 추가)
             now = datetime.utcnow()
-            items = db.query(ItemDB).filter(
+            # 지역명(region.sigungu)은 같은 쿼리에서 JOIN으로 함께 로드 (상품별 추가 SELECT 방지)
+            items = db.query(ItemDB).options(joinedload(ItemDB.region)).filter(
                 ItemDB.item_id.in_(recommended_item_ids),
                 ItemDB.item_status == ItemStatusEnum.BIDDING,
                 ItemDB.end_time > now
             ).all()
             
+            # IN 조회 결과는 DB 순서이므로, 후보 점수 순서(recommended_item_ids)로 다시 정렬
+            items_by_id = {item.item_id: item for item in items}
+            ranked_items = [items_by_id[item_id] for item_id in recommended_item_ids if item_id in items_by_id]
+            
             # 7. ItemRecommendation 객체로 변환
             recommended_items = []
-            for item in items[:n_recommendations]:
+            for item in ranked_items[:n_recommendations]:
                 recommendation = ItemRecommendation(
                     item_id=item.item_id,
                     name=item.name,
@@ -272,11 +433,18 @@ class AuctionRecommender:
                 recommended_items.append(recommendation)
             
             # Cold Start 대응: 결과가 부족하면 인기 상품으로 채우기
+            degraded = False
             if len(recommended_items) < n_recommendations:
-                print(f"추천 결과가 부족합니다 ({len(recommended_items)}/{n_recommendations}). 인기 상품으로 보완합니다.")
+                logger.info(
+                    "사용자 %s: 추천 결과가 부족합니다 (%s/%s). 인기 상품으로 보완합니다.",
+                    target_user_id, len(recommended_items), n_recommendations,
+                )
                 # ⭐ 롤백 후 인기 상품 조회
                 db.rollback()
-                popular_items = self._get_popular_items(target_user_id, n_recommendations - len(recommended_items), db)
+                popular_items = self._get_popular_items(
+                    target_user_id, n_recommendations - len(recommended_items), db, user_interacted
+                )
+                degraded = popular_items.degraded
                 
                 existing_ids = {item.item_id for item in recommended_items}
                 for item in popular_items:
@@ -285,48 +453,58 @@ class AuctionRecommender:
                         if len(recommended_items) >= n_recommendations:
                             break
             
-            print(f"추천 생성 완료. 추천 상품 수: {len(recommended_items)}")
-            return recommended_items
+            logger.debug("사용자 %s 추천 생성 완료. 추천 상품 수: %s", target_user_id, len(recommended_items))
+            return RecommendationList(recommended_items, degraded=degraded)
         
-        except Exception as e:
+        except Exception:
             # ⭐ 에러 발생 시 반드시 롤백
-            print(f"[ERROR] 추천 생성 중 오류 발생: {str(e)}")
+            logger.exception("사용자 %s 추천 생성 중 오류 발생", target_user_id)
             db.rollback()
-            # 인기 상품으로 폴백
-            return self._get_popular_items(target_user_id, n_recommendations, db)
+            # 인기 상품으로 폴백 (오류로 인한 결과이므로 degraded 표시)
+            popular_items = self._get_popular_items(target_user_id, n_recommendations, db, user_interacted)
+            return RecommendationList(popular_items, degraded=True)
     
     def _get_popular_items(
         self, 
         target_user_id: int, 
         n_items: int,
-        db_session: Session = None  # ⭐ 새 파라미터 추가
-    ) -> List[ItemRecommendation]:
+        db_session: Session,
+        user_interacted: Optional[np.ndarray] = None
+    ) -> RecommendationList:
         """
         인기 상품 추천 (Cold Start 대응)
+        
+        Args:
+            user_interacted: 제외할 상품 ID 배열 (recommend_items 에서 계산한 값 재사용, 없으면 user_interacted 매핑에서 조회)
         """
         from datetime import datetime, timedelta
         
-        # ⭐ 세션 선택
-        db = db_session if db_session is not None else self.db
+        db = db_session
         
         try:
             # 사용자가 이미 접한 상품 제외
-            user_interacted = self.user_bid_items.get(target_user_id, set()) | \
-                             self.user_liked_items.get(target_user_id, set())
+            if user_interacted is None:
+                user_interacted = self.user_interacted.get(target_user_id, _EMPTY_IDS)
             
             # 최근 3일 내 생성된 입찰 가능한 인기 상품 조회
             three_days_ago = datetime.utcnow() - timedelta(days=3)
             now = datetime.utcnow()
             
-            # ⭐ 쿼리 간소화
-            query = db.query(ItemDB).filter(
+            # ⭐ 쿼리 간소화 (scripts/sql/item_popular_index.sql 의 부분 인덱스로 정렬 없이 상위 N개 조회)
+            query = db.query(ItemDB).options(joinedload(ItemDB.region)).filter(
                 ItemDB.item_status == ItemStatusEnum.BIDDING,
                 ItemDB.end_time > now,
                 ItemDB.created_at > three_days_ago
             )
             
-            if user_interacted:
-                query = query.filter(~ItemDB.item_id.in_(user_interacted))
+            if len(user_interacted) > _NOT_IN_ARRAY_THRESHOLD:
+                # 제외 상품이 많으면 NOT IN (:p1, ..., :pN) 대신 배열 파라미터 하나로 전달
+                # (상품 수와 무관하게 SQL 문이 같아 문장 캐시/플랜 재사용)
+                query = query.filter(
+                    ItemDB.item_id != all_(literal(user_interacted.tolist(), ARRAY(BigInteger)))
+                )
+            elif len(user_interacted):
+                query = query.filter(~ItemDB.item_id.in_(user_interacted.tolist()))
             
             items = query.order_by(
                 ItemDB.bid_count.desc(),
@@ -334,7 +512,7 @@ class AuctionRecommender:
             ).limit(n_items * 2).all()
             
             # ItemRecommendation 객체로 변환
-            popular_items = []
+            popular_items = RecommendationList()
             for item in items[:n_items]:
                 recommendation = ItemRecommendation(
                     item_id=item.item_id,
@@ -353,8 +531,133 @@ class AuctionRecommender:
             
             return popular_items
         
-        except Exception as e:
-            # ⭐ 에러 발생 시 롤백 후 빈 리스트 반환
-            print(f"[ERROR] 인기 상품 조회 중 오류 발생: {str(e)}")
+        except Exception:
+            # ⭐ 에러 발생 시 롤백 후 빈 리스트 반환 (degraded 표시)
+            logger.exception("인기 상품 조회 중 오류 발생")
             db.rollback()
-            return []
\ No newline at end of file
+            return RecommendationList(degraded=True)
+
+
+# ==================== 프로세스 공유 인스턴스 ====================
+# 추천기는 요청마다 만들지 않고 프로세스당 하나를 공유한다.
+# 만료(REC_REBUILD_TTL)되었거나 invalidate_recommender() 로 무효화되면
+# 기존 인스턴스로 계속 응답하면서 백그라운드 스레드 하나가 새로 빌드해 교체한다.
+REC_REBUILD_TTL = int(os.getenv("REC_REBUILD_TTL", "300"))
+
+# 빌드할 때마다 저장하고, 재시작 시 REC_SNAPSHOT_MAX_AGE 이내의 스냅샷이면 DB 빌드 없이 바로 사용
+# (스냅샷이 REC_REBUILD_TTL 보다 오래됐으면 첫 요청부터 백그라운드 재빌드가 시작됨)
+REC_SNAPSHOT_PATH = os.getenv("REC_SNAPSHOT_PATH")
+REC_SNAPSHOT_MAX_AGE = int(os.getenv("REC_SNAPSHOT_MAX_AGE", "3600"))
+
+# 무효화 신호 파일: invalidate_recommender() 가 mtime 을 갱신하고, 모든 워커가 get_recommender() 에서 비교
+# (POST 를 받은 워커뿐 아니라 같은 호스트/컨테이너의 모든 uvicorn 워커가 재빌드하도록 파일시스템으로 공유)
+REC_INVALIDATION_FILE = os.getenv(
+    "REC_INVALIDATION_FILE", os.path.join(tempfile.gettempdir(), "recommender.invalidated")
+)
+
+_instance: Optional[AuctionRecommender] = None
+_instance_version = 0
+_built_at = 0.0
+# 현재 인스턴스가 반영한 무효화 신호 (신호 파일의 mtime_ns, 파일이 없으면 0)
+_built_gen = 0
+_rebuilding = False
+_rebuild_lock = threading.Lock()
+
+
+def _read_invalidation_gen() -> int:
+    """무효화 신호 파일의 mtime_ns (없거나 읽을 수 없으면 0)"""
+    try:
+        return os.stat(REC_INVALIDATION_FILE).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _swap_instance(recommender: AuctionRecommender, target_gen: int):
+    """공유 인스턴스 교체 (버전 증가 → 이전 추천 결과 캐시 무효화)"""
+    global _instance, _instance_version, _built_at, _built_gen, _rebuilding
+
+    with _rebuild_lock:
+        _instance = recommender
+        _instance_version += 1
+        _built_at = recommender.built_at
+        _built_gen = target_gen
+        _rebuilding = False
+
+
+def _build_instance():
+    """새 세션으로 추천기를 빌드해 공유 인스턴스를 교체"""
+    global _built_at, _rebuilding
+
+    # 빌드 시작 시점의 신호를 기록 → 빌드 중에 들어온 무효화는 완료 후 다시 재빌드
+    target_gen = _read_invalidation_gen()
+
+    db = SessionLocal()
+    try:
+        recommender = AuctionRecommender(db)
+    except Exception:
+        logger.exception("추천 시스템 재빌드 실패 (기존 인스턴스 유지)")
+        with _rebuild_lock:
+            # 다음 TTL 만료까지 재시도하지 않음
+            _built_at = time.time()
+            _rebuilding = False
+        return
+    finally:
+        db.close()
+
+    _swap_instance(recommender, target_gen)
+
+    if REC_SNAPSHOT_PATH:
+        try:
+            recommender.save(REC_SNAPSHOT_PATH)
+        except Exception:
+            logger.exception("추천기 스냅샷 저장 실패: %s", REC_SNAPSHOT_PATH)
+
+
+def init_recommender():
+    """서버 시작 시 추천기 준비 (lifespan 에서 호출) - 유효한 스냅샷이 있으면 로드, 없으면 동기 빌드"""
+    global _rebuilding
+
+    with _rebuild_lock:
+        _rebuilding = True
+    target_gen = _read_invalidation_gen()
+
+    if REC_SNAPSHOT_PATH:
+        recommender = AuctionRecommender.load(REC_SNAPSHOT_PATH, REC_SNAPSHOT_MAX_AGE)
+        if recommender is not None:
+            _swap_instance(recommender, target_gen)
+            return
+
+    _build_instance()
+
+
+def get_recommender() -> Tuple[Optional[AuctionRecommender], int]:
+    """
+    공유 추천기 인스턴스와 버전 반환
+
+    만료 또는 (어느 워커에서든) 무효화된 경우 백그라운드 재빌드를 시작하고 기존 인스턴스를 그대로 반환한다.
+
+    Returns:
+        (추천기 인스턴스 또는 None, 인스턴스 버전) - 버전은 결과 캐시 키에 사용
+    """
+    global _rebuilding
+
+    invalidated_gen = _read_invalidation_gen()
+
+    with _rebuild_lock:
+        stale = (
+            time.time() - _built_at > REC_REBUILD_TTL
+            or invalidated_gen != _built_gen
+        )
+        if stale and not _rebuilding:
+            _rebuilding = True
+            threading.Thread(
+                target=_build_instance, name="recommender-rebuild", daemon=True
+            ).start()
+        return _instance, _instance_version
+
+
+def invalidate_recommender():
+    """입찰/찜/상품 변경 후 호출 - 신호 파일 mtime 을 갱신해 모든 워커가 다음 조회 시 재빌드"""
+    with open(REC_INVALIDATION_FILE, "a"):
+        pass
+    os.utime(REC_INVALIDATION_FILE, None)
@@ -1,8 +1,10 @@
 import os
 import uuid
 from io import BytesIO
+from typing import BinaryIO
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from dotenv import load_dotenv
 
@@ -23,11 +25,66 @@ if AWS_ACCESS_KEY and AWS_SECRET_KEY:
     _session_kwargs["aws_secret_access_key"] = AWS_SECRET_KEY
 
 _session = boto3.session.Session(**_session_kwargs)
+# 커넥션 풀을 넉넉히 두고 TCP keepalive 로 유휴 연결을 살려 두어 업로드마다 TLS 핸드셰이크를 반복하지 않음
+# (동시 업로드 수 x 멀티파트 동시성을 감당할 수 있도록 풀 크기를 잡음)
 _s3_client = _session.client(
     "s3",
-    config=Config(retries={"max_attempts": 3, "mode": "standard"}),
+    config=Config(
+        retries={"max_attempts": 3, "mode": "standard"},
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=30,
+    ),
 )
 
+# 8MB 단위 멀티파트 전송: 파일 전체를 메모리에 올리지 않고 청크 단위로 스트리밍
+# 큰 파일은 청크를 최대 8개 스레드로 병렬 업로드
+_transfer_config = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
+# 이 크기 미만의 바이트는 BytesIO 로 감싸지 않고 put_object 한 번으로 전송
+_PUT_OBJECT_MAX_BYTES = 5 * 1024 * 1024
+
+
+def _build_key(prefix: str, filename: str | None) -> str:
+    ext = ""
+    if filename and "." in filename:
+        ext = os.path.splitext(filename)[1]
+    return f"{prefix.rstrip('/')}/{uuid.uuid4().hex}{ext or '.png'}"
+
+
+def _public_url(key: str) -> str:
+    return f"https://{S3_BUCKET_NAME}.s3.{S3_REGION}.amazonaws.com/{key}"
+
+
+def upload_fileobj(
+    fileobj: BinaryIO,
+    prefix: str,
+    filename: str | None = None,
+    content_type: str | None = None,
+) -> str:
+    """파일 객체를 S3에 스트리밍 업로드하고 공개 URL을 반환."""
+    key = _build_key(prefix, filename)
+
+    extra_args: dict[str, str] = {}
+    if content_type:
+        extra_args["ContentType"] = content_type
+
+    _s3_client.upload_fileobj(
+        fileobj,
+        S3_BUCKET_NAME,
+        key,
+        ExtraArgs=extra_args,
+        Config=_transfer_config,
+    )
+    return _public_url(key)
+
 
 def upload_bytes(
     data: bytes,
@@ -36,14 +93,15 @@ def upload_bytes(
     content_type: str | None = None,
 ) -> str:
     """바이트 데이터를 S3에 업로드하고 공개 URL을 반환."""
-    ext = ""
-    if filename and "." in filename:
-        ext = os.path.splitext(filename)[1]
-    key = f"{prefix.rstrip('/')}/{uuid.uuid4().hex}{ext or '.png'}"
+    if len(data) >= _PUT_OBJECT_MAX_BYTES:
+        # 큰 데이터는 멀티파트로 청크 병렬 업로드
+        return upload_fileobj(BytesIO(data), prefix, filename=filename, content_type=content_type)
 
+    # 작은 데이터는 복사 없이 bytes 그대로 단일 PUT
+    key = _build_key(prefix, filename)
     extra_args: dict[str, str] = {}
     if content_type:
         extra_args["ContentType"] = content_type
 
-    _s3_client.upload_fileobj(BytesIO(data), S3_BUCKET_NAME, key, ExtraArgs=extra_args)
-    return f"https://{S3_BUCKET_NAME}.s3.{S3_REGION}.amazonaws.com/{key}"
\ No newline at end of file
+    _s3_client.put_object(Bucket=S3_BUCKET_NAME, Key=key, Body=data, **extra_args)
+    return _public_url(key)